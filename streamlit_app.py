@@ -3,11 +3,25 @@ import streamlit as st
 import sqlite3
 import hashlib
 import pandas as pd
+import numpy as np
 import requests
 from datetime import datetime, timedelta, date
 import pytz
 from dateutil import parser as dateparser
 import uuid
+import re
+import json
+import html
+import codecs
+import sys
+import os
+import queue
+import threading
+import time
+import functools
+from contextlib import contextmanager
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Inicializar session_state antes de usarlo para evitar errores
@@ -142,17 +156,250 @@ ESPN_SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nf
 DUBLIN_TZ = pytz.timezone("Europe/Dublin")
 UTC = pytz.UTC
 MAX_PICKS_PER_WEEK = 5
+PICK_LOCK_BEFORE = timedelta(hours=2)  # picks close this long before kickoff
+RESULTS_PAGE_SIZE = 200        # players per page of the colored results table
+PICK_COLUMNS_CHUNK = 50000     # picks converted per batch by load_pick_columns
+DB_POOL_SIZE = 8               # idle connections kept open per process
+DB_BUSY_TIMEOUT_MS = 5000      # wait this long on a locked DB before failing
+DATA_VERSION_CHECK_SECONDS = 5 # how often cached reads re-check the DB version
+HTTP_TIMEOUT_SECONDS = 10
+HTTP_RETRIES = 3               # attempts per request (timeouts, 429 and 5xx)
+HTTP_BACKOFF_SECONDS = 0.5     # doubled after each failed attempt
+ESPN_MAX_WORKERS = 4           # concurrent scoreboard requests
+ODDS_CACHE_TTL_SECONDS = 900   # reuse an Odds API response for this long
+ODDS_CACHE_KEEP_DAYS = 7       # cached responses older than this are pruned
+ODDS_QUOTA_LOW = 100           # fewer requests left -> cache TTL x ODDS_LOW_QUOTA_TTL_FACTOR
+ODDS_LOW_QUOTA_TTL_FACTOR = 4
+ODDS_QUOTA_RESERVE = 20        # fewer requests left -> stop calling the API, serve cache
+ODDS_STREAM_CHUNK_BYTES = 64 * 1024
+SPREAD_CONSENSUS = "median"    # "median", "mean" or "mode" across bookmakers
+SPREAD_PREFERRED_BOOKS = ()    # e.g. ("draftkings", "fanduel"): only these count when quoted
+SPREAD_ROUND_TO = 0.5          # consensus lines are rounded to this step
+
+# background polling (see PollScheduler); "live" = a game is on or about to start
+RUN_POLLER_IN_APP = True       # False when a separate `--worker` process polls
+POLL_TICK_SECONDS = 15
+POLL_INTERVALS = {             # job -> (live seconds, idle seconds)
+    "scores": (120, 3600),
+    "fixtures": (1800, 6 * 3600),
+}
+POLL_LIVE_BEFORE = timedelta(minutes=30)
+POLL_LIVE_AFTER = timedelta(hours=4)
+POLL_LEASE_SECONDS = 600       # single-flight lease, expires if a poller dies
+WINDOW_ROLL_GRACE = timedelta(hours=12)  # keep polling MNF scores after Tue 00:00
 
 
 # ---------------- DB helpers ----------------
-def get_conn():
-    return sqlite3.connect(DB_FILE, check_same_thread=False)
+class ConnectionPool:
+    """
+    Small pool of tuned SQLite connections shared by every Streamlit session.
+    The outermost db() block of a thread checks a connection out and wraps the
+    block in one transaction; nested helper calls on the same thread reuse it.
+    """
+
+    def __init__(self, path, size=DB_POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._local = threading.local()
+
+    def after_commit(self, callback):
+        """Run callback once the current thread's transaction has committed."""
+        pending = getattr(self._local, "after_commit", None)
+        if pending is None:
+            pending = self._local.after_commit = []
+        pending.append(callback)
+
+    def _open(self):
+        conn = sqlite3.connect(self.path,
+                               check_same_thread=False,
+                               isolation_level=None,
+                               timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA cache_size=-16000")      # ~16 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")    # 256 MB
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    @contextmanager
+    def connection(self, immediate=False):
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None:
+            # nested call -> join the transaction already open on this thread
+            yield conn
+            return
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        local.conn = conn
+        local.after_commit = []
+        try:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            yield conn
+            conn.execute("COMMIT")
+            for callback in local.after_commit:
+                callback()
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            local.conn = None
+            local.after_commit = []
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+
+@st.cache_resource
+def _db_pool(path):
+    # one pool per process, survives Streamlit reruns
+    return ConnectionPool(path)
+
+
+def db(immediate=False):
+    """
+    Context manager yielding this thread's pooled connection.
+    Commits when the outermost block exits, rolls back on error.
+    immediate=True takes the write lock up front (BEGIN IMMEDIATE).
+    """
+    return _db_pool(DB_FILE).connection(immediate)
+
+
+# ---------------- Read cache ----------------
+class ReadCache:
+    """
+    In-process cache for read helpers, keyed by the data_version counter in
+    the DB. Writers bump the counter (see bump_data_version), so entries from
+    an older version are never served; other processes notice the bump within
+    DATA_VERSION_CHECK_SECONDS. Cached values are shared: do not mutate them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._version = None
+        self._checked_at = 0.0
+
+    def current_version(self):
+        now = time.monotonic()
+        with self._lock:
+            if (self._version is not None
+                    and now - self._checked_at < DATA_VERSION_CHECK_SECONDS):
+                return self._version
+        with db() as conn:
+            row = conn.execute(
+                "SELECT version FROM data_version WHERE id=1").fetchone()
+        version = row[0] if row else 0
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+            self._version, self._checked_at = version, now
+        return version
+
+    def get_or_compute(self, name, args, compute, rev_pos=None):
+        key = (self.current_version(), name, args)
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            if rev_pos is not None:
+                # args[rev_pos] is a revision counter: older ones are never
+                # asked for again, so drop them rather than wait for a bump
+                rev = args[rev_pos]
+                for old in [k for k in self._entries
+                            if k[1] == name and k[2][rev_pos] < rev]:
+                    del self._entries[old]
+        return value
+
+    def invalidate(self):
+        # force the next read to re-check the DB version
+        with self._lock:
+            self._version = None
+
+
+@st.cache_resource
+def _read_cache(path):
+    return ReadCache()
+
+
+def cached_read(fn=None, *, rev=None):
+    """
+    Memoize a read helper (by name + positional args) until the data version
+    changes. rev names an argument holding a revision counter such as
+    picks_version(): caching a newer revision evicts the helper's entries
+    for older ones.
+    """
+    if fn is None:
+        return functools.partial(cached_read, rev=rev)
+    rev_pos = None if rev is None else fn.__code__.co_varnames.index(rev)
+
+    @functools.wraps(fn)
+    def wrapper(*args):
+        return _read_cache(DB_FILE).get_or_compute(fn.__name__, args,
+                                                   lambda: fn(*args), rev_pos)
+    return wrapper
+
+
+def bump_data_version():
+    """Mark cached reads stale; call from writers inside their db() block."""
+    with db() as conn:
+        conn.execute("UPDATE data_version SET version = version + 1 WHERE id=1")
+        _db_pool(DB_FILE).after_commit(_read_cache(DB_FILE).invalidate)
+
+
+def picks_version():
+    """
+    Counter bumped whenever picks or their outcomes change. Pick saves do not
+    bump the data version (that would drop every cached read on each save),
+    so cached reads over picks take this as an argument instead.
+    """
+    with db() as conn:
+        return conn.execute(
+            "SELECT version FROM picks_version WHERE id=1").fetchone()[0]
+
+
+def bump_picks_version(conn):
+    conn.execute("UPDATE picks_version SET version = version + 1 WHERE id=1")
 
 
 def hash_pw(password: str) -> str:
     return hashlib.sha256((password or "").encode()).hexdigest()
 
 
+USERS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY,
+        username TEXT NOT NULL UNIQUE,
+        password_hash TEXT NOT NULL,
+        is_admin INTEGER NOT NULL DEFAULT 0 CHECK (is_admin IN (0,1))
+    )
+"""
+
+FIXTURES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS fixtures (
+        fixture_key INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        home TEXT,
+        away TEXT,
+        kickoff TEXT,
+        spread_home REAL,
+        spread_away REAL,
+        kickoff_epoch INTEGER,
+        book_count INTEGER,
+        spread_stdev REAL,
+        lock_at INTEGER
+    )
+"""
+
+
 def migrate_or_create_users_table(conn):
     """
     Ensure users table has username, password_hash, is_admin.
@@ -162,14 +409,7 @@ def migrate_or_create_users_table(conn):
     c.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
     if not c.fetchone():
-        c.execute("""
-            CREATE TABLE users (
-                username TEXT PRIMARY KEY,
-                password_hash TEXT NOT NULL,
-                is_admin INTEGER NOT NULL DEFAULT 0 CHECK (is_admin IN (0,1))
-            )
-            """)
-        conn.commit()
+        c.execute(USERS_TABLE_SQL)
         return
 
     # table exists — ensure columns
@@ -179,7 +419,6 @@ def migrate_or_create_users_table(conn):
 
     if "password_hash" not in cols:
         c.execute("ALTER TABLE users ADD COLUMN password_hash TEXT")
-        conn.commit()
         if "password" in cols:
             # migrate legacy plaintext password -> hashed column
             c.execute("SELECT username, password FROM users")
@@ -190,218 +429,1174 @@ def migrate_or_create_users_table(conn):
                         (hash_pw(pw or ""), username))
                 except Exception:
                     pass
-            conn.commit()
 
     if "is_admin" not in cols:
         c.execute("ALTER TABLE users ADD COLUMN is_admin INTEGER DEFAULT 0")
-        conn.commit()
 
 
-def init_db():
-    conn = get_conn()
-    migrate_or_create_users_table(conn)
+def migrate_fixtures_table(conn):
+    """
+    Ensure fixtures has an indexed kickoff_epoch (UTC seconds) column so
+    window / ISO-week lookups are range queries. Backfills existing rows.
+    Also adds the consensus-spread stats (book_count, spread_stdev) and an
+    indexed lock_at (kickoff_epoch - PICK_LOCK_BEFORE), re-derived on every
+    start so a changed lock window applies to stored fixtures too.
+    """
     c = conn.cursor()
+    c.execute("PRAGMA table_info(fixtures)")
+    cols = [cinfo[1] for cinfo in c.fetchall()]
+    if "book_count" not in cols:
+        c.execute("ALTER TABLE fixtures ADD COLUMN book_count INTEGER")
+    if "spread_stdev" not in cols:
+        c.execute("ALTER TABLE fixtures ADD COLUMN spread_stdev REAL")
+    if "kickoff_epoch" not in cols:
+        c.execute("ALTER TABLE fixtures ADD COLUMN kickoff_epoch INTEGER")
+        c.execute("SELECT id, kickoff FROM fixtures")
+        c.executemany("UPDATE fixtures SET kickoff_epoch=? WHERE id=?",
+                      [(kickoff_epoch(k), fid) for fid, k in c.fetchall()])
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_fixtures_kickoff_epoch ON fixtures (kickoff_epoch)")
+    if "lock_at" not in cols:
+        c.execute("ALTER TABLE fixtures ADD COLUMN lock_at INTEGER")
+    lead = int(PICK_LOCK_BEFORE.total_seconds())
+    c.execute("UPDATE fixtures SET lock_at = kickoff_epoch - ? "
+              "WHERE lock_at IS NOT kickoff_epoch - ?", (lead, lead))
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_fixtures_lock_at ON fixtures (lock_at)")
 
+
+def migrate_picks_table(conn):
+    """
+    Ensure picks carry a snapshot of what was picked: the side, both spreads
+    and the kickoff at submission time, plus submitted_at (UTC seconds).
+    Scoring reads only the snapshot, so later fixture updates cannot change
+    points. Existing picks are backfilled from the current fixtures
+    (submitted_at stays NULL).
+    """
+    c = conn.cursor()
+    c.execute("PRAGMA table_info(picks)")
+    cols = [cinfo[1] for cinfo in c.fetchall()]
+    if "pick_side" not in cols:
+        for col, typ in (("pick_side", "TEXT"), ("spread_home", "REAL"),
+                         ("spread_away", "REAL"), ("kickoff_epoch", "INTEGER"),
+                         ("submitted_at", "INTEGER")):
+            if col not in cols:
+                c.execute(f"ALTER TABLE picks ADD COLUMN {col} {typ}")
+        # same side rule the old scoring used: not the home team -> away
+        c.execute("""
+            UPDATE picks SET
+              pick_side = (SELECT CASE WHEN f.home = picks.pick_team
+                                       THEN 'home' ELSE 'away' END
+                           FROM fixtures f WHERE f.id = picks.fixture_id),
+              spread_home = (SELECT f.spread_home FROM fixtures f WHERE f.id = picks.fixture_id),
+              spread_away = (SELECT f.spread_away FROM fixtures f WHERE f.id = picks.fixture_id),
+              kickoff_epoch = (SELECT f.kickoff_epoch FROM fixtures f WHERE f.id = picks.fixture_id)
+        """)
+    if "week_id" not in cols:
+        # week_id / matchkey let SQLite enforce one side per game and the
+        # weekly cap itself; legacy rows are keyed by their kickoff
+        c.execute("ALTER TABLE picks ADD COLUMN week_id INTEGER")
+        c.execute("ALTER TABLE picks ADD COLUMN matchkey TEXT")
+        # derived once per distinct kickoff / fixture, applied in SQL
+        c.execute("CREATE TEMP TABLE pick_weeks (kickoff_epoch INTEGER PRIMARY KEY, week_id INTEGER)")
+        c.execute("SELECT DISTINCT kickoff_epoch FROM picks WHERE kickoff_epoch IS NOT NULL")
+        c.executemany("INSERT INTO pick_weeks VALUES (?, ?)",
+                      [(ko, week_id_of(ko)) for ko, in c.fetchall()])
+        c.execute("CREATE TEMP TABLE pick_matchkeys (fixture_id TEXT PRIMARY KEY, matchkey TEXT)")
+        c.execute("SELECT id, home, away FROM fixtures WHERE id IN (SELECT fixture_id FROM picks)")
+        c.executemany("INSERT INTO pick_matchkeys VALUES (?, ?)",
+                      [(fid, "|".join(matchkey(home, away)))
+                       for fid, home, away in c.fetchall() if home and away])
+        c.execute("""
+            UPDATE picks SET
+              week_id = (SELECT w.week_id FROM pick_weeks w
+                         WHERE w.kickoff_epoch = picks.kickoff_epoch),
+              matchkey = (SELECT k.matchkey FROM pick_matchkeys k
+                          WHERE k.fixture_id = picks.fixture_id)
+        """)
+        c.execute("DROP TABLE pick_weeks")
+        c.execute("DROP TABLE pick_matchkeys")
+        # old data may hold both listings of a game -> keep the first one in
+        # the week, the rest drop out of the unique index (NULL week_id)
+        c.execute("""
+            UPDATE picks SET week_id = NULL
+            WHERE week_id IS NOT NULL AND rowid NOT IN (
+                SELECT MIN(rowid) FROM picks WHERE week_id IS NOT NULL
+                GROUP BY username, week_id, matchkey)
+        """)
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_picks_fixture ON picks (fixture_id)")
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_picks_kickoff_epoch ON picks (kickoff_epoch)")
     c.execute("""
-        CREATE TABLE IF NOT EXISTS fixtures (
-            id TEXT PRIMARY KEY,
-            home TEXT,
-            away TEXT,
-            kickoff TEXT,
-            spread_home REAL,
-            spread_away REAL
-        )
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_picks_week_matchkey
+        ON picks (username, week_id, matchkey)
     """)
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS picks (
-            username TEXT,
-            fixture_id TEXT,
-            pick_team TEXT,
-            PRIMARY KEY (username, fixture_id)
+    # weekly cap; rows for the same fixture/game are skipped because the
+    # insert will replace or ignore them. Recreated on every start so a
+    # changed MAX_PICKS_PER_WEEK takes effect.
+    over_cap = f"""
+        (SELECT COUNT(*) FROM picks
+         WHERE username = NEW.username AND week_id = NEW.week_id
+           AND fixture_id <> NEW.fixture_id
+           AND matchkey IS NOT NEW.matchkey) >= {int(MAX_PICKS_PER_WEEK)}
+    """
+    for name, event in (("picks_week_cap_insert", "INSERT"),
+                        ("picks_week_cap_update", "UPDATE OF username, week_id")):
+        c.execute(f"DROP TRIGGER IF EXISTS {name}")
+        c.execute(f"""
+            CREATE TRIGGER {name} BEFORE {event} ON picks
+            WHEN NEW.week_id IS NOT NULL AND {over_cap}
+            BEGIN
+                SELECT RAISE(ABORT, '{PICK_LIMIT_ERROR}');
+            END
+        """)
+
+
+def migrate_results_table(conn):
+    """
+    Ensure results has the final flag: 0 marks a live score saved while the
+    game is on, which is shown but not scored. Existing rows count as final.
+    Runs before init_db's standings backfill, which scores final rows only.
+    """
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(results)")]
+    if "final" not in cols:
+        conn.execute(
+            "ALTER TABLE results ADD COLUMN final INTEGER NOT NULL DEFAULT 1")
+
+
+# ---------------- Schema migrations ----------------
+# Numbered, run-once schema steps on top of the idempotent migrate_* checks
+# above. Each applied step is recorded in schema_migrations.
+SCHEMA_MIGRATIONS = []
+
+
+def schema_migration(version):
+    """Register fn(conn) as schema step `version`."""
+    def register(fn):
+        SCHEMA_MIGRATIONS.append((version, fn))
+        return fn
+    return register
+
+
+def migrate_schema(conn):
+    """
+    Apply the registered steps newer than the DB's schema version, in order,
+    logging each one's runtime. Runs inside init_db's transaction, so a
+    failing step rolls back together with everything before it.
+    Returns the versions applied.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TEXT,
+            elapsed_ms REAL
         )
     """)
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS results (
-            fixture_id TEXT PRIMARY KEY,
-            score_home INTEGER,
-            score_away INTEGER
-        )
+    current = conn.execute(
+        "SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+    applied = []
+    for version, fn in sorted(SCHEMA_MIGRATIONS, key=lambda m: m[0]):
+        if version <= current:
+            continue
+        t0 = time.perf_counter()
+        fn(conn)
+        conn.execute(
+            "INSERT INTO schema_migrations (version, name, applied_at, elapsed_ms) VALUES (?, ?, ?, ?)",
+            (version, fn.__name__, datetime.now(UTC).isoformat(),
+             round((time.perf_counter() - t0) * 1000, 1)))
+        applied.append(version)
+    return applied
+
+
+def _rebuild_with_key(conn, table, create_sql, key, natural):
+    """
+    Recreate table from create_sql (which adds the INTEGER PRIMARY KEY `key`)
+    and copy the rows over, keeping their rowid as the new key. Columns
+    that create_sql no longer has are dropped; rows without the natural key
+    cannot be kept. No-op if the key already exists.
+    """
+    old_cols = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+    if key in old_cols:
+        return
+    conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    conn.execute(create_sql)
+    new_cols = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+    cols = ", ".join(col for col in old_cols if col in new_cols)
+    conn.execute(f"""
+        INSERT INTO {table} ({key}, {cols})
+        SELECT rowid, {cols} FROM {table}_old WHERE {natural} IS NOT NULL
+        ORDER BY rowid
     """)
-    # store published results week (year, week) - only last row matters
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS results_week (
-            year INTEGER,
-            week INTEGER
+    conn.execute(f"DROP TABLE {table}_old")
+
+
+@schema_migration(1)
+def add_surrogate_keys(conn):
+    """
+    Integer keys next to the text ones: users.user_id, fixtures.fixture_key
+    (both = old rowid, so rowid ordering is unchanged) and a teams registry
+    (team_id, name, abbr) seeded from NFL_TEAMS, fixtures and picks.
+    """
+    conn.execute("UPDATE users SET password_hash = '' WHERE password_hash IS NULL")
+    conn.execute("UPDATE users SET is_admin = 0 WHERE is_admin IS NULL")
+    _rebuild_with_key(conn, "users", USERS_TABLE_SQL, "user_id", "username")
+    _rebuild_with_key(conn, "fixtures", FIXTURES_TABLE_SQL, "fixture_key", "id")
+    migrate_fixtures_table(conn)  # indexes went with the old table
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS teams (
+            team_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            abbr TEXT
         )
     """)
-    # store "active window" (start/end UTC) for the NFL week chosen on Tuesday
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS active_window (
-            id INTEGER PRIMARY KEY CHECK (id=1),
-            start_utc TEXT,
-            end_utc TEXT
-        )
+    names = [name for name, _, _ in NFL_TEAMS.values()]
+    names += [r[0] for r in conn.execute("""
+        SELECT home FROM fixtures UNION SELECT away FROM fixtures
+        UNION SELECT pick_team FROM picks
+    """) if r[0]]
+    save_teams(conn, names)
+
+
+@schema_migration(2)
+def add_picks_week_indexes(conn):
+    """
+    Covering indexes for the week-scoped picks reads: a player's picks of a
+    week and the per-team/per-side selection counts never touch the table.
+    """
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_picks_week_user
+        ON picks (week_id, username, fixture_id, pick_team)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_picks_week_team
+        ON picks (week_id, pick_team, fixture_id, pick_side)
     """)
-    conn.commit()
-    conn.close()
+
+
+@schema_migration(3)
+def normalize_stored_kickoffs(conn):
+    """
+    Rewrite stored kickoffs in KICKOFF_FORMAT (same instant, so kickoff_epoch
+    and lock_at are unchanged); ORDER BY kickoff now sorts chronologically.
+    """
+    rows = conn.execute("SELECT fixture_key, kickoff FROM fixtures").fetchall()
+    conn.executemany(
+        "UPDATE fixtures SET kickoff=? WHERE fixture_key=?",
+        [(normalize_kickoff(k), key) for key, k in rows
+         if normalize_kickoff(k) != k])
+
+
+def init_db():
+    with db() as conn:
+        migrate_or_create_users_table(conn)
+        c = conn.cursor()
+
+        c.execute(FIXTURES_TABLE_SQL)
+        migrate_fixtures_table(conn)
+        # append-only line movement: one row per real spread change
+        c.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='spread_history'")
+        history_missing = c.fetchone() is None
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS spread_history (
+                fixture_id TEXT,
+                observed_at INTEGER,
+                spread_home REAL,
+                spread_away REAL,
+                source TEXT,
+                PRIMARY KEY (fixture_id, observed_at)
+            ) WITHOUT ROWID
+        """)
+        if history_missing:
+            # seed with the lines we already have
+            c.execute("""
+                INSERT INTO spread_history (fixture_id, observed_at, spread_home, spread_away, source)
+                SELECT id, ?, spread_home, spread_away, 'initial' FROM fixtures
+                WHERE spread_home IS NOT NULL OR spread_away IS NOT NULL
+            """, (int(time.time()),))
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS picks (
+                username TEXT,
+                fixture_id TEXT,
+                pick_team TEXT,
+                PRIMARY KEY (username, fixture_id)
+            )
+        """)
+        migrate_picks_table(conn)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                fixture_id TEXT PRIMARY KEY,
+                score_home INTEGER,
+                score_away INTEGER,
+                final INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        migrate_results_table(conn)
+        # store published results week (year, week) - only last row matters
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS results_week (
+                year INTEGER,
+                week INTEGER
+            )
+        """)
+        # store "active window" (start/end UTC) for the NFL week chosen on Tuesday
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS active_window (
+                id INTEGER PRIMARY KEY CHECK (id=1),
+                start_utc TEXT,
+                end_utc TEXT
+            )
+        """)
+        # materialized leaderboard: one row per player per ISO week of kickoff
+        # (year=0, week=0 for fixtures without a usable kickoff)
+        c.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='standings'")
+        standings_missing = c.fetchone() is None
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS standings (
+                username TEXT,
+                year INTEGER,
+                week INTEGER,
+                points INTEGER NOT NULL DEFAULT 0,
+                played INTEGER NOT NULL DEFAULT 0,
+                wins INTEGER NOT NULL DEFAULT 0,
+                pushes INTEGER NOT NULL DEFAULT 0,
+                losses INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (username, year, week)
+            )
+        """)
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_standings_week ON standings (year, week)")
+        # bumped by every writer so cached reads know when to reload
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS data_version (
+                id INTEGER PRIMARY KEY CHECK (id=1),
+                version INTEGER NOT NULL
+            )
+        """)
+        c.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+        # bumped on pick saves, which leave data_version alone (see picks_version)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS picks_version (
+                id INTEGER PRIMARY KEY CHECK (id=1),
+                version INTEGER NOT NULL
+            )
+        """)
+        c.execute("INSERT OR IGNORE INTO picks_version (id, version) VALUES (1, 0)")
+        # one row per outgoing API request (timing / retries / outcome)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS fetch_log (
+                source TEXT,
+                request TEXT,
+                started_at TEXT,
+                elapsed_ms REAL,
+                attempts INTEGER,
+                status TEXT
+            )
+        """)
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fetch_log_source ON fetch_log (source, started_at)")
+        # background poller: single-flight leases and run history
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS poll_lease (
+                job TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at INTEGER NOT NULL
+            )
+        """)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS poll_runs (
+                job TEXT,
+                started_at TEXT,
+                finished_at TEXT,
+                elapsed_ms REAL,
+                status TEXT,
+                detail TEXT
+            )
+        """)
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_poll_runs_job ON poll_runs (job, started_at)")
+        # Odds API responses (replayable offline) and quota headers
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS odds_cache (
+                cache_key TEXT PRIMARY KEY,
+                regions TEXT,
+                markets TEXT,
+                fetched_at INTEGER,
+                body TEXT
+            )
+        """)
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_odds_cache_fetched ON odds_cache (regions, markets, fetched_at)")
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS odds_quota (
+                observed_at INTEGER,
+                requests_remaining INTEGER,
+                requests_used INTEGER,
+                requests_last INTEGER
+            )
+        """)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS poll_requests (
+                job TEXT PRIMARY KEY,
+                requested_at TEXT
+            )
+        """)
+        # persisted score of every pick with a result; input_hash covers the
+        # pick snapshot and final score, so unchanged picks are never rescored
+        c.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='pick_outcomes'")
+        outcomes_missing = c.fetchone() is None
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS pick_outcomes (
+                username TEXT,
+                fixture_id TEXT,
+                year INTEGER,
+                week INTEGER,
+                pts INTEGER NOT NULL,
+                input_hash TEXT NOT NULL,
+                PRIMARY KEY (username, fixture_id)
+            ) WITHOUT ROWID
+        """)
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pick_outcomes_fixture ON pick_outcomes (fixture_id)")
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pick_outcomes_week ON pick_outcomes (year, week)")
+        if standings_missing or outcomes_missing:
+            # first run on an existing DB -> backfill from picks/results
+            refresh_standings()
+        migrate_schema(conn)
 
     # ensure admin user exists
     create_default_admin()
 
+
+@st.cache_resource
+def _db_initialized(path):
+    # schema checks/migrations run once per process, not on every rerun
+    init_db()
+    return True
+
 def create_default_admin():
-    conn = get_conn()
-    c = conn.cursor()
-    try:
-        c.execute("SELECT username FROM users WHERE username=?", ("admin", ))
-        if not c.fetchone():
+    with db() as conn:
+        c = conn.cursor()
+        try:
+            c.execute("SELECT username FROM users WHERE username=?", ("admin", ))
+            if not c.fetchone():
+                add_user("admin", "admin123", is_admin=True)
+        except Exception:
             add_user("admin", "admin123", is_admin=True)
-    except Exception:
-        add_user("admin", "admin123", is_admin=True)
-    finally:
-        conn.close()
 
 
 # ---------------- Users ----------------
 def add_user(username: str, password: str, is_admin: bool = False):
     if not username or not password:
         return
-    conn = get_conn()
-    c = conn.cursor()
-    try:
-        c.execute(
-            "INSERT INTO users (username, password_hash, is_admin) VALUES (?, ?, ?)",
-            (username, hash_pw(password), 1 if is_admin else 0),
-        )
-    except sqlite3.IntegrityError:
-        # user exists -> update password_hash if needed
+    with db() as conn:
+        c = conn.cursor()
         try:
-            c.execute("UPDATE users SET password_hash=? WHERE username=?",
-                      (hash_pw(password), username))
-        except Exception:
-            pass
-    conn.commit()
-    conn.close()
+            c.execute(
+                "INSERT INTO users (username, password_hash, is_admin) VALUES (?, ?, ?)",
+                (username, hash_pw(password), 1 if is_admin else 0),
+            )
+        except sqlite3.IntegrityError:
+            # user exists -> update password_hash if needed
+            try:
+                c.execute("UPDATE users SET password_hash=? WHERE username=?",
+                          (hash_pw(password), username))
+            except Exception:
+                pass
+        bump_data_version()
 
 
 def validate_user(username: str, password: str):
     """Return (valid: bool, is_admin: bool)."""
     if not username or not password:
         return False, False
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("SELECT password_hash, is_admin FROM users WHERE username=?",
-              (username, ))
-    row = c.fetchone()
-    conn.close()
+    with db() as conn:
+        row = conn.execute(
+            "SELECT password_hash, is_admin FROM users WHERE username=?",
+            (username, )).fetchone()
     if not row:
         return False, False
     return (row[0] == hash_pw(password)), bool(row[1])
 
 
+@cached_read
 def is_admin_user(username: str) -> bool:
     if not username:
         return False
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("SELECT is_admin FROM users WHERE username=?", (username, ))
-    row = c.fetchone()
-    conn.close()
+    with db() as conn:
+        row = conn.execute("SELECT is_admin FROM users WHERE username=?",
+                           (username, )).fetchone()
     return bool(row and row[0] == 1)
 
 
-# ---------------- Fixtures (Odds API) ----------------
-def fetch_fixtures_from_oddsapi(regions="us", markets="spreads"):
-    """Return a list of fixtures tuples (id, home, away, kickoff, spread_home, spread_away)."""
-    if not ODDS_API_KEY:
-        st.warning("ODDS_API_KEY not configured — skipping Odds API fetch.")
-        return []
+# ---------------- Teams ----------------
+# Canonical registry: abbreviation -> (name, ESPN team id, extra aliases).
+# name is what both The Odds API and ESPN's displayName use; the nickname
+# (last word) and the abbreviation are always accepted as aliases too.
+NFL_TEAMS = {
+    "ARI": ("Arizona Cardinals", "22", ()),
+    "ATL": ("Atlanta Falcons", "1", ()),
+    "BAL": ("Baltimore Ravens", "33", ()),
+    "BUF": ("Buffalo Bills", "2", ()),
+    "CAR": ("Carolina Panthers", "29", ()),
+    "CHI": ("Chicago Bears", "3", ()),
+    "CIN": ("Cincinnati Bengals", "4", ()),
+    "CLE": ("Cleveland Browns", "5", ()),
+    "DAL": ("Dallas Cowboys", "6", ()),
+    "DEN": ("Denver Broncos", "7", ()),
+    "DET": ("Detroit Lions", "8", ()),
+    "GB": ("Green Bay Packers", "9", ("GNB", )),
+    "HOU": ("Houston Texans", "34", ()),
+    "IND": ("Indianapolis Colts", "11", ()),
+    "JAX": ("Jacksonville Jaguars", "30", ("JAC", )),
+    "KC": ("Kansas City Chiefs", "12", ("KAN", )),
+    "LV": ("Las Vegas Raiders", "13", ("Oakland Raiders", "OAK", "LVR")),
+    "LAC": ("Los Angeles Chargers", "24", ("San Diego Chargers", "SD")),
+    "LAR": ("Los Angeles Rams", "14", ("St. Louis Rams", "LA", "STL")),
+    "MIA": ("Miami Dolphins", "15", ()),
+    "MIN": ("Minnesota Vikings", "16", ()),
+    "NE": ("New England Patriots", "17", ("NWE", )),
+    "NO": ("New Orleans Saints", "18", ("NOR", )),
+    "NYG": ("New York Giants", "19", ()),
+    "NYJ": ("New York Jets", "20", ()),
+    "PHI": ("Philadelphia Eagles", "21", ()),
+    "PIT": ("Pittsburgh Steelers", "23", ()),
+    "SF": ("San Francisco 49ers", "25", ("SFO", )),
+    "SEA": ("Seattle Seahawks", "26", ()),
+    "TB": ("Tampa Bay Buccaneers", "27", ("TAM", )),
+    "TEN": ("Tennessee Titans", "10", ()),
+    "WSH": ("Washington Commanders", "28",
+            ("Washington Football Team", "Washington Redskins", "Washington",
+             "WAS")),
+}
+
+
+def _norm_team(name):
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", (name or "").lower()).split())
+
+
+@functools.lru_cache(maxsize=1)
+def _team_aliases():
+    """normalized alias -> abbreviation, and ESPN id -> abbreviation."""
+    by_alias, by_espn_id = {}, {}
+    for abbr, (name, espn_id, aliases) in NFL_TEAMS.items():
+        for alias in (name, name.split()[-1], abbr) + tuple(aliases):
+            by_alias[_norm_team(alias)] = abbr
+        by_espn_id[espn_id] = abbr
+    return by_alias, by_espn_id
+
+
+def canonical_team(name=None, espn_id=None):
+    """
+    Registry abbreviation for a team name/alias or ESPN id. Unknown names
+    fall back to their normalized form so they can still match exactly.
+    """
+    by_alias, by_espn_id = _team_aliases()
+    if espn_id is not None and str(espn_id) in by_espn_id:
+        return by_espn_id[str(espn_id)]
+    norm = _norm_team(name)
+    return by_alias.get(norm, norm)
 
-    params = {
-        "apiKey": ODDS_API_KEY,
-        "regions": regions,
-        "markets": markets,
-        "oddsFormat": "decimal",
-    }
+
+def save_teams(conn, names):
+    """Register team names in teams (new names get the next team_id)."""
+    conn.executemany(
+        "INSERT OR IGNORE INTO teams (name, abbr) VALUES (?, ?)",
+        [(name, canonical_team(name)) for name in dict.fromkeys(names) if name])
+
+
+def build_fixture_match_index(rows):
+    """
+    Hash index over fixture rows for O(1) result matching:
+      (home, away, kickoff UTC date) -> fixture id
+      (home, away) -> fixture id, only when that pairing is unique
+    Teams are registry abbreviations (see canonical_team).
+    """
+    by_date, by_pair, pair_count = {}, {}, {}
+    for fid, home, away, kickoff, *_ in rows:
+        pair = (canonical_team(home), canonical_team(away))
+        ko = safe_parse(kickoff)
+        if ko:
+            by_date.setdefault(pair + (ko.date(), ), fid)
+        by_pair[pair] = fid
+        pair_count[pair] = pair_count.get(pair, 0) + 1
+    by_pair = {p: fid for p, fid in by_pair.items() if pair_count[p] == 1}
+    return by_date, by_pair
+
+
+def match_fixture(index, home, away, kickoff_date=None):
+    """
+    Look up the fixture for a home/away pairing (either orientation).
+    Returns (fixture_id, swapped) or (None, False); swapped=True means the
+    fixture lists the teams the other way round.
+    """
+    by_date, by_pair = index
+    for key, swapped in (((home, away), False), ((away, home), True)):
+        if kickoff_date is not None and key + (kickoff_date, ) in by_date:
+            return by_date[key + (kickoff_date, )], swapped
+    for key, swapped in (((home, away), False), ((away, home), True)):
+        if key in by_pair:
+            return by_pair[key], swapped
+    return None, False
+
+
+# ---------------- HTTP ----------------
+@st.cache_resource
+def _http_session():
+    # shared keep-alive session, sized for the concurrent ESPN fetches
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=2,
+                                            pool_maxsize=ESPN_MAX_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def redact_query(text):
+    """Drop URL query strings (they carry apiKey=...) from error text."""
+    return re.sub(r"\?[^\s'\"]*", "?<redacted>", text)
+
+
+def http_get(source, url, params, stream=False):
+    """
+    GET url, retrying timeouts, connection errors, 429 and 5xx with
+    exponential backoff. Never raises.
+    Returns (response_or_None, log_row) where log_row is ready for
+    log_fetches(); the response is only returned for a 2xx/3xx answer.
+    With stream=True the body is left unread (use resp.iter_content).
+    """
+    started_at = datetime.now(UTC).isoformat()
+    t0 = time.perf_counter()
+    ok_resp, status, attempt = None, "error", 0
+    for attempt in range(1, HTTP_RETRIES + 1):
+        try:
+            resp = _http_session().get(url, params=params,
+                                       timeout=HTTP_TIMEOUT_SECONDS,
+                                       stream=stream)
+            if resp.status_code == 429 or resp.status_code >= 500:
+                status = f"HTTP {resp.status_code}"
+            elif resp.status_code >= 400:
+                # 4xx -> retrying won't help; the status line only, as the
+                # HTTPError text would carry the full URL with the API key
+                status = f"HTTP {resp.status_code} {resp.reason}"
+                resp.close()
+                break
+            else:
+                ok_resp, status = resp, "ok"
+                break
+        except (requests.ConnectionError, requests.Timeout) as e:
+            status = f"error: {e.__class__.__name__}"
+        except Exception as e:
+            status = f"error: {redact_query(str(e))}"
+            break
+        if attempt < HTTP_RETRIES:
+            time.sleep(HTTP_BACKOFF_SECONDS * 2 ** (attempt - 1))
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    request = "&".join(f"{k}={v}" for k, v in (params or {}).items()
+                       if k != "apiKey")
+    return ok_resp, [source, request, started_at, round(elapsed_ms, 1),
+                     attempt, status]
+
+
+def http_get_json(source, url, params):
+    """http_get() + JSON decoding. Returns (data_or_None, log_row)."""
+    resp, log_row = http_get(source, url, params)
+    if resp is None:
+        return None, log_row
     try:
-        r = requests.get(ODDS_API_URL, params=params, timeout=10)
-        r.raise_for_status()
-        data = r.json()
-    except Exception as e:
-        st.error(f"Failed to fetch from Odds API: {e}")
-        return []
+        return resp.json(), log_row
+    except ValueError as e:
+        log_row[-1] = f"error: bad JSON ({e})"
+        return None, log_row
 
-    fixtures = []
-    for g in data:
-        fid = g.get("id") or uuid.uuid4().hex
-        home = g.get("home_team")
-        away = g.get("away_team")
-        kickoff = g.get("commence_time")
-        spread_home = None
-        spread_away = None
+
+def log_fetches(rows):
+    if not rows:
+        return
+    with db() as conn:
+        conn.executemany(
+            "INSERT INTO fetch_log (source, request, started_at, elapsed_ms, attempts, status) VALUES (?, ?, ?, ?, ?, ?)",
+            rows)
+
+
+def recent_fetches(source, limit=20):
+    """Latest fetch_log rows for a source as a DataFrame (newest first)."""
+    with db() as conn:
+        return pd.read_sql_query(
+            """SELECT started_at AS "Started (UTC)", request AS Request,
+                      elapsed_ms AS "ms", attempts AS Attempts, status AS Status
+               FROM fetch_log WHERE source=?
+               ORDER BY started_at DESC LIMIT ?""",
+            conn, params=(source, limit))
+
+
+# ---------------- Fixtures (Odds API) ----------------
+def _header_int(headers, name):
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+def odds_quota():
+    """Latest (requests_remaining, requests_used, observed_at epoch) from the Odds API headers, or None."""
+    with db() as conn:
+        return conn.execute(
+            """SELECT requests_remaining, requests_used, observed_at
+               FROM odds_quota ORDER BY observed_at DESC, rowid DESC LIMIT 1""").fetchone()
+
+
+def load_cached_odds(regions, markets, cache_key=None):
+    """
+    Cached Odds API body: the exact cache_key if given, otherwise the most
+    recent response for (regions, markets) regardless of age. None if absent.
+    """
+    with db() as conn:
+        if cache_key is not None:
+            row = conn.execute("SELECT body FROM odds_cache WHERE cache_key=?",
+                               (cache_key, )).fetchone()
+        else:
+            row = conn.execute(
+                """SELECT body FROM odds_cache WHERE regions=? AND markets=?
+                   ORDER BY fetched_at DESC, rowid DESC LIMIT 1""",
+                (regions, markets)).fetchone()
+    return row[0] if row else None
+
+
+def _store_odds_response(regions, markets, cache_key, body, headers):
+    now = int(time.time())
+    with db() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO odds_cache (cache_key, regions, markets, fetched_at, body) VALUES (?, ?, ?, ?, ?)",
+            (cache_key, regions, markets, now, body))
+        conn.execute("DELETE FROM odds_cache WHERE fetched_at < ?",
+                     (now - ODDS_CACHE_KEEP_DAYS * 86400, ))
+        remaining = _header_int(headers, "x-requests-remaining")
+        if remaining is not None:
+            conn.execute(
+                "INSERT INTO odds_quota (observed_at, requests_remaining, requests_used, requests_last) VALUES (?, ?, ?, ?)",
+                (now, remaining, _header_int(headers, "x-requests-used"),
+                 _header_int(headers, "x-requests-last")))
+
+
+def iter_json_array(chunks):
+    """
+    Yield the elements of a top-level JSON array one at a time from an
+    iterable of bytes/str chunks, so only one element (plus the unread
+    tail of the current chunk) is held in memory. An element is only
+    yielded once the ',' or ']' after it has arrived, so a number split
+    across chunks is not cut short. Raises ValueError on malformed input,
+    including a missing separator or data after the closing ']'.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf, pos = "", 0
+
+    def more():
+        nonlocal buf, pos
+        for chunk in chunks:
+            text = utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                buf = buf[pos:] + text
+                pos = 0
+                return True
+        utf8.decode(b"", final=True)  # raises on a truncated UTF-8 sequence
+        return False
+
+    def skip_ws(i):
+        while i < len(buf) and buf[i] in " \t\r\n":
+            i += 1
+        return i
+
+    def peek():
+        # next non-whitespace char ("" at end of input); pos is moved onto it
+        nonlocal pos
+        while True:
+            pos = skip_ws(pos)
+            if pos < len(buf):
+                return buf[pos]
+            if not more():
+                return ""
+
+    if peek() != "[":
+        raise ValueError("expected a JSON array")
+    pos += 1
+    sep = "]" if peek() == "]" else ","
+    if sep == "]":
+        pos += 1
+    while sep == ",":
+        peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # element not complete yet -> read more
+                if not more():
+                    raise
+                continue
+            # complete only once the separator is buffered (or input ended):
+            # "[1" / "2]" or "1.5e" / "3" must not stop at the chunk edge
+            nxt = skip_ws(end)
+            if (nxt < len(buf) and buf[nxt] in ",]") or not more():
+                break
+        pos = end
+        sep = peek()
+        if sep not in (",", "]"):
+            raise ValueError("unexpected end of JSON array" if not sep else
+                             f"expected ',' or ']' in JSON array, got {sep!r}")
+        pos += 1
+        yield value
+    if peek():
+        raise ValueError("unexpected data after JSON array")
+
+
+def compact_odds_game(g):
+    """
+    Keep only what we use from one Odds API game: id, teams, kickoff and
+    each bookmaker's spread points as [book, home_point, away_point].
+    Already-compact games are returned unchanged.
+    """
+    if "books" in g:
+        return g
+    home = g.get("home_team")
+    away = g.get("away_team")
+    books = []
+    for bm in g.get("bookmakers", []) or []:
+        for mk in bm.get("markets", []) or []:
+            if mk.get("key") != "spreads":
+                continue
+            points = {o.get("name"): o.get("point")
+                      for o in mk.get("outcomes", []) or []}
+            books.append([bm.get("key"), points.get(home), points.get(away)])
+            break
+    return {"id": g.get("id") or uuid.uuid4().hex, "home": home, "away": away,
+            "kickoff": g.get("commence_time"), "books": books}
+
+
+def consensus_spreads(games, method=None, preferred=None):
+    """
+    Consensus home spread per game across all bookmakers, in one vectorized
+    pass over every quote of the slate. A book's home line is its home
+    point, or minus its away point when only that is quoted. When any of
+    the preferred books quote a game only those are used for it.
+    Returns (spread_home, book_count, stdev) arrays aligned with games;
+    spread_home is NaN and stdev is NaN for games without quotes.
+    """
+    method = method or SPREAD_CONSENSUS
+    preferred = SPREAD_PREFERRED_BOOKS if preferred is None else preferred
+    if method not in ("median", "mean", "mode"):
+        raise ValueError(f"unknown spread consensus method: {method}")
+    n = len(games)
+    quotes = [(i, b[0], b[1], b[2]) for i, g in enumerate(games)
+              for b in g["books"]]
+    out_line = np.full(n, np.nan)
+    out_std = np.full(n, np.nan)
+    if not quotes:
+        return out_line, np.zeros(n, dtype=np.int64), out_std
+
+    game = np.fromiter((q[0] for q in quotes), dtype=np.int64, count=len(quotes))
+    ph = np.array([q[2] for q in quotes], dtype=float)
+    pa = np.array([q[3] for q in quotes], dtype=float)
+    line = np.where(np.isnan(ph), -pa, ph)
+    keep = ~np.isnan(line)
+    if preferred:
+        pref = np.isin(np.array([q[1] for q in quotes], dtype=object),
+                       list(preferred))
+        game_has_pref = np.bincount(game[keep & pref], minlength=n) > 0
+        keep &= pref | ~game_has_pref[game]
+    game, line = game[keep], line[keep]
+
+    count = np.bincount(game, minlength=n)
+    has = count > 0
+    total = np.bincount(game, weights=line, minlength=n)
+    mean = np.divide(total, count, out=np.full(n, np.nan), where=has)
+    sq = np.bincount(game, weights=(line - mean[game]) ** 2, minlength=n)
+    out_std[has] = np.sqrt(sq[has] / count[has])
+
+    # quotes grouped by game, ascending line within a game
+    order = np.lexsort((line, game))
+    game, line = game[order], line[order]
+    start = np.concatenate(([0], np.cumsum(count)[:-1]))
+    lo = start + (count - 1) // 2
+    hi = start + count // 2
+    median = np.full(n, np.nan)
+    median[has] = (line[lo[has]] + line[hi[has]]) / 2
+
+    if method == "median":
+        out_line = median
+    elif method == "mean":
+        out_line = mean
+    else:
+        # runs of equal (game, line); most quoted wins, ties go to the
+        # value nearest the median
+        new_run = np.ones(len(line), dtype=bool)
+        new_run[1:] = (game[1:] != game[:-1]) | (line[1:] != line[:-1])
+        run_start = np.flatnonzero(new_run)
+        run_len = np.diff(np.append(run_start, len(line)))
+        run_game, run_line = game[run_start], line[run_start]
+        best = np.lexsort((np.abs(run_line - median[run_game]), -run_len, run_game))
+        first = np.ones(len(best), dtype=bool)
+        first[1:] = run_game[best][1:] != run_game[best][:-1]
+        out_line[run_game[best][first]] = run_line[best][first]
+
+    if SPREAD_ROUND_TO:
+        out_line = np.round(out_line / SPREAD_ROUND_TO) * SPREAD_ROUND_TO
+    return out_line, count, out_std
+
+
+def fetch_fixtures_from_oddsapi(regions="us", markets="spreads", offline=False):
+    """
+    Return a list of fixtures tuples (id, home, away, kickoff, spread_home,
+    spread_away, book_count, spread_stdev) with the consensus spread.
+    Responses are cached per (regions, markets, time bucket); the bucket
+    grows when the quota runs low, and below ODDS_QUOTA_RESERVE (or with
+    offline=True) the latest cached response is replayed instead.
+    Raises RuntimeError if nothing usable can be fetched
+    (runs in the background poller, so there is no page to report to).
+    """
+    quota = odds_quota()
+    remaining = quota[0] if quota else None
+    ttl = ODDS_CACHE_TTL_SECONDS
+    if remaining is not None and remaining < ODDS_QUOTA_LOW:
+        ttl *= ODDS_LOW_QUOTA_TTL_FACTOR
+    cache_key = f"{regions}|{markets}|{ttl}|{int(time.time() // ttl)}"
+
+    # cached bodies hold the compact games (see compact_odds_game)
+    body = load_cached_odds(regions, markets, cache_key)
+    if body is None and (offline or (remaining is not None
+                                     and remaining < ODDS_QUOTA_RESERVE)):
+        body = load_cached_odds(regions, markets)
+        if body is None:
+            raise RuntimeError(
+                f"Odds API quota low ({remaining} left) and no cached response to reuse."
+                if not offline else "No cached Odds API response to replay.")
+
+    if body is None:
+        if not ODDS_API_KEY:
+            raise RuntimeError("ODDS_API_KEY not configured — skipping Odds API fetch.")
+        params = {
+            "apiKey": ODDS_API_KEY,
+            "regions": regions,
+            "markets": markets,
+            "oddsFormat": "decimal",
+        }
+        resp, log_row = http_get("odds", ODDS_API_URL, params, stream=True)
+        if resp is None:
+            log_fetches([log_row])
+            raise RuntimeError(f"Failed to fetch from Odds API: {log_row[-1]}")
         try:
-            for bm in g.get("bookmakers", []):
-                for mk in bm.get("markets", []):
-                    if mk.get("key") == "spreads":
-                        for o in mk.get("outcomes", []):
-                            name = o.get("name")
-                            point = o.get("point")
-                            if name == home:
-                                spread_home = float(
-                                    point) if point is not None else None
-                            elif name == away:
-                                spread_away = float(
-                                    point) if point is not None else None
-                        raise StopIteration
-        except StopIteration:
-            pass
-        except Exception:
-            pass
+            # decode game by game as the body streams in
+            games = [compact_odds_game(g) for g in iter_json_array(
+                resp.iter_content(ODDS_STREAM_CHUNK_BYTES))]
+        except (ValueError, requests.RequestException) as e:
+            log_row[-1] = f"error: {redact_query(str(e))}"
+            raise RuntimeError(f"Failed to fetch from Odds API: {log_row[-1]}") from e
+        finally:
+            resp.close()
+            log_fetches([log_row])
+        _store_odds_response(regions, markets, cache_key, json.dumps(games),
+                             resp.headers)
+        return parse_odds_payload(games)
 
-        if fid and home and away:
-            fixtures.append(
-                (fid, home, away, kickoff, spread_home, spread_away))
+    try:
+        games = [compact_odds_game(g) for g in iter_json_array([body])]
+    except ValueError as e:
+        raise RuntimeError(f"Bad cached Odds API response: {e}") from e
+    return parse_odds_payload(games)
+
+
+def parse_odds_payload(games):
+    """
+    Fixture tuples from compact Odds API games with the consensus spread:
+    (id, home, away, kickoff, spread_home, spread_away, book_count, spread_stdev).
+    """
+    line, count, stdev = consensus_spreads(games)
+    fixtures = []
+    for g, sh, n, sd in zip(games, line.tolist(), count.tolist(), stdev.tolist()):
+        home, away = g["home"], g["away"]
+        if not (g["id"] and home and away):
+            continue
+        if sh != sh:  # NaN: no bookmaker quotes this game
+            fixtures.append((g["id"], home, away, g["kickoff"], None, None, 0, None))
+        else:
+            fixtures.append((g["id"], home, away, g["kickoff"], sh, -sh + 0.0,
+                             n, round(sd, 3)))
     return fixtures
 
 
-def save_fixtures(fixtures):
-    """Insert or update fixtures. Returns number saved (new or updated)."""
-    if not fixtures:
-        return 0
-    conn = get_conn()
-    c = conn.cursor()
-    saved = 0
-    for f in fixtures:
-        fid, home, away, kickoff, sh, sa = f
-        try:
-            # upsert by id
-            c.execute(
+def save_fixtures(fixtures, source="oddsapi"):
+    """
+    Bulk upsert of fixture tuples (id, home, away, kickoff, spread_home,
+    spread_away[, book_count, spread_stdev]) in one transaction. Incoming
+    rows are diffed against the stored ones and only rows that really
+    changed are written; a change in the bookmaker stats alone is stored
+    but not reported. New lines and spread moves are appended to
+    spread_history, tagged with source. Kickoffs are stored normalized
+    (see normalize_kickoff) next to their epoch.
+    Returns a change report: {"new", "spread_moved", "kickoff_changed",
+    "renamed", "unchanged"} -> lists of fixture ids (a fixture can be in
+    both spread_moved and kickoff_changed).
+    """
+    report = {"new": [], "spread_moved": [], "kickoff_changed": [],
+              "renamed": [], "unchanged": []}
+    incoming = {}
+    for f in fixtures or []:
+        fid, home, away, kickoff, sh, sa = f[:6]
+        books, stdev = (tuple(f[6:8]) + (None, None))[:2]
+        kickoff = normalize_kickoff(kickoff)
+        if fid:
+            incoming[fid] = (fid, home, away, kickoff,
+                             None if sh is None else float(sh),
+                             None if sa is None else float(sa),
+                             kickoff_epoch(kickoff), books, stdev,
+                             lock_at_epoch(kickoff_epoch(kickoff)))
+    if not incoming:
+        return report
+
+    ids = list(incoming)
+    with db(immediate=True) as conn:
+        stored = {
+            r[0]: r for r in conn.execute(
+                f"""SELECT id, home, away, kickoff, spread_home, spread_away,
+                           kickoff_epoch, book_count, spread_stdev
+                    FROM fixtures WHERE id IN ({','.join('?' * len(ids))})""",
+                ids)
+        }
+        changed, writes, lines = [], [], []
+        for fid, row in incoming.items():
+            old = stored.get(fid)
+            has_line = row[4] is not None or row[5] is not None
+            if old is None:
+                report["new"].append(fid)
+                changed.append(row)
+                if has_line:
+                    lines.append(row)
+                continue
+            spread_moved = (old[4], old[5]) != (row[4], row[5])
+            kickoff_changed = old[6] != row[6]
+            renamed = (old[1], old[2]) != (row[1], row[2])
+            if spread_moved:
+                report["spread_moved"].append(fid)
+                if has_line:
+                    lines.append(row)
+            if kickoff_changed:
+                report["kickoff_changed"].append(fid)
+            if renamed:
+                report["renamed"].append(fid)
+            if spread_moved or kickoff_changed or renamed:
+                changed.append(row)
+            else:
+                report["unchanged"].append(fid)
+                if row[7] is not None and (old[7], old[8]) != (row[7], row[8]):
+                    writes.append(row)
+
+        if changed:
+            save_teams(conn, [t for row in changed for t in (row[1], row[2])])
+        if changed or writes:
+            conn.executemany(
                 """
-                INSERT INTO fixtures (id, home, away, kickoff, spread_home, spread_away)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO fixtures (id, home, away, kickoff, spread_home, spread_away,
+                                      kickoff_epoch, book_count, spread_stdev, lock_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(id) DO UPDATE SET
                   home=excluded.home,
                   away=excluded.away,
                   kickoff=excluded.kickoff,
                   spread_home=excluded.spread_home,
-                  spread_away=excluded.spread_away
-            """, (fid, home, away, kickoff, sh, sa))
-            saved += 1
-        except Exception:
-            pass
-    conn.commit()
-    conn.close()
-    return saved
+                  spread_away=excluded.spread_away,
+                  kickoff_epoch=excluded.kickoff_epoch,
+                  lock_at=excluded.lock_at,
+                  book_count=COALESCE(excluded.book_count, fixtures.book_count),
+                  spread_stdev=CASE WHEN excluded.book_count IS NULL
+                                    THEN fixtures.spread_stdev
+                                    ELSE excluded.spread_stdev END
+                """, changed + writes)
+        if lines:
+            now = int(time.time())
+            conn.executemany(
+                """INSERT OR REPLACE INTO spread_history
+                   (fixture_id, observed_at, spread_home, spread_away, source)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(row[0], now, row[4], row[5], source) for row in lines])
+        # picks are scored against their own snapshot, so standings are
+        # unaffected by spread/kickoff changes here; the book stats in writes
+        # are read uncached (spread_stats), so they need no version bump
+        if changed:
+            bump_data_version()
+    return report
+
+
+@cached_read
+def load_all_fixtures():
+    with db() as conn:
+        return conn.execute(
+            "SELECT id, home, away, kickoff, spread_home, spread_away FROM fixtures ORDER BY kickoff"
+        ).fetchall()
 
 
-def load_all_fixtures():
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute(
-        "SELECT id, home, away, kickoff, spread_home, spread_away FROM fixtures ORDER BY kickoff"
-    )
-    rows = c.fetchall()
-    conn.close()
-    return rows
+@cached_read
+def load_fixtures_between(start_utc, end_utc):
+    """Fixtures with start_utc <= kickoff < end_utc, via the kickoff_epoch index."""
+    with db() as conn:
+        return conn.execute(
+            """SELECT id, home, away, kickoff, spread_home, spread_away
+               FROM fixtures
+               WHERE kickoff_epoch >= ? AND kickoff_epoch < ?
+               ORDER BY kickoff_epoch""",
+            (int(start_utc.timestamp()), int(end_utc.timestamp()))).fetchall()
+
+
+def spread_as_of(fixture_ids, at_epoch):
+    """
+    {fixture_id: (spread_home, spread_away)} for the latest line recorded at
+    or before at_epoch (UTC seconds). Fixtures with no line yet are omitted.
+    """
+    if not fixture_ids:
+        return {}
+    with db() as conn:
+        return {
+            fid: (sh, sa) for fid, sh, sa in conn.execute(
+                f"""SELECT h.fixture_id, h.spread_home, h.spread_away
+                    FROM spread_history h
+                    WHERE h.fixture_id IN ({','.join('?' * len(fixture_ids))})
+                      AND h.observed_at = (
+                        SELECT MAX(observed_at) FROM spread_history
+                        WHERE fixture_id = h.fixture_id AND observed_at <= ?)""",
+                list(fixture_ids) + [int(at_epoch)])
+        }
+
+
+def load_spread_history(fixture_id):
+    """Line movement for one fixture, oldest first."""
+    with db() as conn:
+        df = pd.read_sql_query(
+            """SELECT observed_at, spread_home, spread_away, source
+               FROM spread_history WHERE fixture_id = ?
+               ORDER BY observed_at""",
+            conn, params=(fixture_id,))
+    df["Observed (UTC)"] = pd.to_datetime(df["observed_at"], unit="s", utc=True)
+    return df.rename(columns={"spread_home": "Spread Home",
+                              "spread_away": "Spread Away",
+                              "source": "Source"})
+
+
+def spread_stats(fixture_ids):
+    """{fixture_id: (book_count, spread_stdev)} for the consensus spreads."""
+    if not fixture_ids:
+        return {}
+    with db() as conn:
+        return {
+            fid: (n, sd) for fid, n, sd in conn.execute(
+                f"""SELECT id, book_count, spread_stdev FROM fixtures
+                    WHERE id IN ({','.join('?' * len(fixture_ids))})""",
+                list(fixture_ids))
+        }
 
 
 def fixtures_to_dataframe(rows):
@@ -425,9 +1620,23 @@ def fixtures_to_dataframe(rows):
 
 
 # ---------------- Helpers ----------------
+KICKOFF_FORMAT = "%Y-%m-%dT%H:%M:%SZ"  # how save_fixtures stores kickoffs (UTC)
+
+
+@functools.lru_cache(maxsize=4096)
 def safe_parse(iso_str):
+    """
+    Aware UTC datetime for an ISO string (None if it can't be parsed).
+    Memoized -- the same kickoff strings are parsed on every rerun -- and
+    stored kickoffs (KICKOFF_FORMAT) skip dateutil altogether.
+    """
     if not iso_str:
         return None
+    if len(iso_str) == 20 and iso_str[10] == "T" and iso_str[19] == "Z":
+        try:
+            return datetime.fromisoformat(iso_str[:19]).replace(tzinfo=UTC)
+        except ValueError:
+            pass
     try:
         dt = dateparser.isoparse(iso_str)
     except Exception:
@@ -439,6 +1648,33 @@ def safe_parse(iso_str):
         dt = dt.replace(tzinfo=UTC)
     return dt.astimezone(UTC)
 
+
+def kickoff_epoch(iso_str):
+    """UTC epoch seconds for a kickoff string (None if it can't be parsed)."""
+    dt = safe_parse(iso_str)
+    return int(dt.timestamp()) if dt else None
+
+
+def normalize_kickoff(iso_str):
+    """Kickoff as stored: KICKOFF_FORMAT in UTC (unparseable input is kept as is)."""
+    dt = safe_parse(iso_str)
+    return dt.strftime(KICKOFF_FORMAT) if dt else iso_str
+
+
+def lock_at_epoch(epoch):
+    """UTC epoch seconds at which picks on a kickoff close (None without one)."""
+    if epoch is None:
+        return None
+    return epoch - int(PICK_LOCK_BEFORE.total_seconds())
+
+
+def iso_week_bounds(year_week_tuple):
+    """[start, end) of an ISO week in UTC (Mon 00:00 -> next Mon 00:00)."""
+    y, w = year_week_tuple
+    start = UTC.localize(datetime.combine(date.fromisocalendar(y, w, 1),
+                                          datetime.min.time()))
+    return start, start + timedelta(days=7)
+
 def publish_week_from_window(start_utc):
     """
     Compute the ISO (year, week) using the Thursday date in Dublin
@@ -450,6 +1686,30 @@ def publish_week_from_window(start_utc):
     y, w, _ = thu_local_date.isocalendar()
     set_published_week((y, w))
 
+
+def week_id_of(epoch):
+    """
+    year*100 + ISO week of the Thursday on or before epoch (Dublin date), so
+    a Thu→Tue window gets the (year, week) publish_week_from_window stores.
+    None without a usable epoch.
+    """
+    if epoch is None:
+        return None
+    local_date = datetime.fromtimestamp(epoch, UTC).astimezone(DUBLIN_TZ).date()
+    thu = local_date - timedelta(days=(local_date.weekday() - 3) % 7)
+    y, w, _ = thu.isocalendar()
+    return y * 100 + w
+
+
+def window_week_id(start_utc):
+    """
+    week_id of a window: year*100 + ISO week of its first day (Dublin). For
+    a Thu→Tue window that equals week_id_of; the Mon→Mon ISO-week fallback
+    keeps its own week instead of the previous Thursday's.
+    """
+    y, w, _ = start_utc.astimezone(DUBLIN_TZ).date().isocalendar()
+    return y * 100 + w
+
 def format_spread(v):
     if v is None:
         return ""
@@ -462,15 +1722,13 @@ def format_spread(v):
 
 def week_of_earliest_upcoming():
     now = datetime.now(UTC)
-    rows = load_all_fixtures()
-    next_dates = []
-    for r in rows:
-        kickoff = safe_parse(r[3])
-        if kickoff and kickoff >= now:
-            next_dates.append(kickoff.date())
-    if not next_dates:
+    with db() as conn:
+        row = conn.execute(
+            "SELECT MIN(kickoff_epoch) FROM fixtures WHERE kickoff_epoch >= ?",
+            (int(now.timestamp()), )).fetchone()
+    if not row or row[0] is None:
         return None
-    earliest = min(next_dates)
+    earliest = datetime.fromtimestamp(row[0], UTC).date()
     return earliest.isocalendar()[0], earliest.isocalendar()[1]
 
 
@@ -490,23 +1748,18 @@ def previous_iso_week(year_week_tuple):
 def fixtures_for_week(year_week_tuple):
     if not year_week_tuple:
         return []
-    y, w = year_week_tuple
-    rows = load_all_fixtures()
-    out = []
-    for r in rows:
-        kickoff = safe_parse(r[3])
-        if kickoff:
-            iy, iw, _ = kickoff.isocalendar()
-            if iy == y and iw == w:
-                out.append(r)
-    return out
+    try:
+        start, end = iso_week_bounds(year_week_tuple)
+    except ValueError:
+        return []
+    return load_fixtures_between(start, end)
 
 
 def fixtures_for_current_week():
     wk = week_of_earliest_upcoming()
     return fixtures_for_week(wk)
 
-def build_team_options_for_active_window():
+def build_team_options_for_active_window(index=None):
     """
     Returns:
       options: list of dicts {label, fid, team, matchkey}
@@ -514,27 +1767,25 @@ def build_team_options_for_active_window():
       label_to_option: reverse map for decoding selections (keyed by team label)
     Only includes fixtures NOT locked (kickoff >= now + 2h).
     Dropdown labels = team name only (e.g., "Buffalo Bills").
+    index: WindowIndex to use (default: active_window_index()).
     """
-    week_rows = fixtures_for_active_window()
+    index = active_window_index() if index is None else index
     now_utc = datetime.now(UTC)
 
     options = []
-    id_to_matchkey = {}
+    id_to_matchkey = dict(index.matchkeys)
     label_to_option = {}
 
-    for fid, home, away, kickoff_iso, sh, sa in week_rows:
-        ko = safe_parse(kickoff_iso)
-        key = tuple(sorted([home.strip().lower(), away.strip().lower()]))
-        id_to_matchkey[fid] = key
-
+    for fid in index.fixture_ids:
         # Lock 2 hours before kickoff
-        if ko and (ko - now_utc) < timedelta(hours=2):
+        if index.is_locked(fid, now_utc):
             continue
 
         # Two options: pick home OR pick away (labels are just the team names)
-        for team in (home, away):
+        for team in index.teams[fid]:
             label = team  # <- show only the team
-            opt = {"label": label, "fid": fid, "team": team, "matchkey": key}
+            opt = {"label": label, "fid": fid, "team": team,
+                   "matchkey": index.matchkeys[fid]}
             options.append(opt)
             # Since each NFL team plays at most once per week, labels are unique
             label_to_option[label] = opt
@@ -543,27 +1794,26 @@ def build_team_options_for_active_window():
     options.sort(key=lambda o: o["label"])
     return options, id_to_matchkey, label_to_option
 
-def existing_picks_in_active_window(username: str):
+def existing_picks_in_active_window(username: str, index=None):
     """Return (existing_opts, existing_matchkeys) for this user in the active window.
     existing_opts = list of dicts {fid, team, matchkey}
     existing_matchkeys = set of matchkeys already picked (one per game).
     """
-    week_rows = fixtures_for_active_window()
-    if not week_rows:
+    index = active_window_index() if index is None else index
+    if not index:
         return [], set()
 
-    # Build fixture -> matchkey
-    id_to_matchkey = {}
-    for fid, home, away, *_ in week_rows:
-        key = tuple(sorted([home.strip().lower(), away.strip().lower()]))
-        id_to_matchkey[fid] = key
-
-    existing = get_user_picks(username)
+    with db() as conn:
+        # covered by idx_picks_week_user
+        existing = conn.execute(
+            """SELECT fixture_id, pick_team FROM picks
+               WHERE week_id=? AND username=? ORDER BY fixture_id""",
+            (index.week_id, username)).fetchall()
     existing_opts = []
     existing_matchkeys = set()
-    for fid, team in existing.items():
-        if fid in id_to_matchkey:
-            mk = id_to_matchkey[fid]
+    for fid, team in existing:
+        if fid in index.matchkeys:
+            mk = index.matchkeys[fid]
             existing_opts.append({"fid": fid, "team": team, "matchkey": mk})
             existing_matchkeys.add(mk)
 
@@ -571,232 +1821,324 @@ def existing_picks_in_active_window(username: str):
 
 # ---------------- Picks ----------------
 def get_user_picks(username):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("SELECT fixture_id, pick_team FROM picks WHERE username=?",
-              (username, ))
-    rows = c.fetchall()
-    conn.close()
+    with db() as conn:
+        rows = conn.execute(
+            "SELECT fixture_id, pick_team FROM picks WHERE username=? ORDER BY fixture_id",
+            (username, )).fetchall()
     return {r[0]: r[1] for r in rows}
 
-def save_user_picks_for_active_window(username, selections: dict):
+PICK_LIMIT_ERROR = "picks_week_cap"
+
+
+def _insert_picks(conn, username, picks, index, on_conflict="REPLACE",
+                  now=None):
     """
-    Same logic as save_user_picks_for_week, but scoped to the ACTIVE WINDOW (Thu→Tue).
-    selections: dict fixture_id -> pick_team
+    Insert (fixture_id, team) picks of one window in a single statement, with
+    a snapshot of the fixture's side, spreads and kickoff as they are right
+    now plus the window's week_id and the game's matchkey. Fixtures whose
+    lock_at has passed are never written. Returns rows inserted.
+    The unique (username, week_id, matchkey) index and the weekly cap
+    trigger raise sqlite3.IntegrityError if the submission breaks them.
     """
-    week_rows = fixtures_for_active_window()
-    if not week_rows:
-        return 0, "No fixtures for the active window."
-
-    id_to_matchkey = {}
-    matchkey_to_ids = {}
-    fid_to_kickoff = {}
-    for r in week_rows:
-        fid, home, away, kickoff, sh, sa = r
-        key = tuple(sorted([home.strip().lower(), away.strip().lower()]))
-        id_to_matchkey[fid] = key
-        matchkey_to_ids.setdefault(key, []).append(fid)
-        fid_to_kickoff[fid] = safe_parse(kickoff) or datetime.max.replace(tzinfo=UTC)
-
-    existing = get_user_picks(username)
-    for fid in list(existing.keys()):
-        if fid in id_to_matchkey:
-            del existing[fid]
-
-    match_selections = {}
-    for fid, team in selections.items():
-        if fid not in id_to_matchkey:
-            continue
-        key = id_to_matchkey[fid]
-        candidate_ids = matchkey_to_ids.get(key, [fid])
-        canonical = min(candidate_ids, key=lambda i: fid_to_kickoff.get(i, datetime.max.replace(tzinfo=UTC)))
-        match_selections[key] = (canonical, team)
+    picks = list(picks)
+    if not picks:
+        return 0
+    values = ",".join(["(?, ?, ?)"] * len(picks))
+    params = [username, int(time.time()) if now is None else now, index.week_id]
+    for fid, team in picks:
+        params += [fid, team, "|".join(index.matchkeys[fid])]
+    conn.execute(
+        f"""INSERT OR {on_conflict} INTO picks
+              (username, fixture_id, pick_team, pick_side, spread_home,
+               spread_away, kickoff_epoch, submitted_at, week_id, matchkey)
+            SELECT u.username, f.id, n.column2,
+                   CASE WHEN f.home = n.column2 THEN 'home' ELSE 'away' END,
+                   f.spread_home, f.spread_away, f.kickoff_epoch,
+                   u.submitted_at, u.week_id, n.column3
+            FROM (SELECT ? AS username, ? AS submitted_at, ? AS week_id) u
+            CROSS JOIN (VALUES {values}) n
+            JOIN fixtures f ON f.id = n.column1
+            WHERE f.lock_at IS NULL OR f.lock_at > u.submitted_at""",
+        params)
+    return conn.execute("SELECT changes()").fetchone()[0]
+
+
+def _pick_error(err):
+    """Player-facing message for an IntegrityError raised by _insert_picks."""
+    if PICK_LIMIT_ERROR in str(err):
+        return f"You can only have {MAX_PICKS_PER_WEEK} picks per week."
+    return "Those picks conflict with a game you have already picked."
+
+
+def _locked_fixtures(conn, fixture_ids, now):
+    """fid -> lock_at (epoch) for the given fixtures already locked at now."""
+    fixture_ids = list(fixture_ids)
+    if not fixture_ids:
+        return {}
+    return dict(conn.execute(
+        f"""SELECT id, lock_at FROM fixtures
+            WHERE id IN ({','.join('?' * len(fixture_ids))}) AND lock_at <= ?""",
+        (*fixture_ids, now)).fetchall())
+
+
+def _reject_locked(conn, picks, now):
+    """
+    Split (fixture_id, team) picks into (open, rejected) against lock_at as
+    stored right now. rejected = list of dicts {fid, team, reason}.
+    """
+    locked = _locked_fixtures(conn, (fid for fid, _ in picks), now)
+    open_picks, rejected = [], []
+    for fid, team in picks:
+        if fid in locked:
+            closed = datetime.fromtimestamp(locked[fid], UTC).astimezone(DUBLIN_TZ)
+            rejected.append({"fid": fid, "team": team,
+                             "reason": f"picks closed {closed:%a %d %b %H:%M}"})
+        else:
+            open_picks.append((fid, team))
+    return open_picks, rejected
 
-    if len(match_selections) + len(existing) > MAX_PICKS_PER_WEEK:
-        return 0, f"Too many picks. You may only have up to {MAX_PICKS_PER_WEEK} picks combining existing and new selections."
 
-    conn = get_conn()
-    c = conn.cursor()
-    week_ids = [r[0] for r in week_rows]
-    if week_ids:
-        placeholders = ",".join("?" * len(week_ids))
-        c.execute(f"DELETE FROM picks WHERE username=? AND fixture_id IN ({placeholders})",
-                  tuple([username] + week_ids))
-        conn.commit()
-
-    saved_count = 0
-    for key, (fid, team) in match_selections.items():
-        c.execute("INSERT OR REPLACE INTO picks (username, fixture_id, pick_team) VALUES (?, ?, ?)",
-                  (username, fid, team))
-        saved_count += 1
-    conn.commit()
-    conn.close()
-    return saved_count, None
-
-def save_user_picks_for_week(username, selections: dict):
-    week_rows = fixtures_for_active_window()
-    if not week_rows:
-        return 0, "No fixtures for the current week."
-
-    id_to_matchkey = {}
-    matchkey_to_ids = {}
-    fid_to_kickoff = {}
-    for r in week_rows:
-        fid, home, away, kickoff, sh, sa = r
-        key = tuple(sorted([home.strip().lower(), away.strip().lower()]))
-        id_to_matchkey[fid] = key
-        matchkey_to_ids.setdefault(key, []).append(fid)
-        fid_to_kickoff[fid] = safe_parse(kickoff) or datetime.max.replace(
-            tzinfo=UTC)
-
-    existing = get_user_picks(username)
-    for fid in list(existing.keys()):
-        if fid in id_to_matchkey:
-            del existing[fid]
+def _replace_window_picks(conn, username, picks, index):
+    """
+    Replace username's picks on the window's open fixtures with picks (one
+    (fixture_id, team) per game). Picks on locked fixtures are kept, and
+    they and picks of the same week_id outside the window count towards
+    MAX_PICKS_PER_WEEK. Runs in the caller's transaction;
+    returns (saved_count, err_or_None, rejected).
+    """
+    now = int(time.time())
+    picks, rejected = _reject_locked(conn, list(picks), now)
+    week_ids = index.fixture_ids
+    locked = _locked_fixtures(conn, week_ids, now)
+    open_ids = [fid for fid in week_ids if fid not in locked]
+    placeholders = ",".join("?" * len(open_ids))
+    kept = conn.execute(
+        f"""SELECT COUNT(*) FROM picks
+            WHERE username=? AND week_id=? AND fixture_id NOT IN ({placeholders})""",
+        (username, index.week_id, *open_ids)).fetchone()[0]
+    if len(picks) + kept > MAX_PICKS_PER_WEEK:
+        return 0, f"Too many picks. You may only have up to {MAX_PICKS_PER_WEEK} picks combining existing and new selections.", rejected
+
+    conn.execute(
+        f"DELETE FROM picks WHERE username=? AND fixture_id IN ({placeholders})",
+        (username, *open_ids))
+    saved_count = _insert_picks(conn, username, picks, index, now=now)
+    refresh_standings(week_ids)
+    return saved_count, None, rejected
+
+def save_user_picks_for_active_window(username, selections: dict, index=None):
+    """
+    Replace the user's picks for the ACTIVE WINDOW (Thu→Tue).
+    selections: dict fixture_id -> pick_team
+    Returns: (saved_count, err_or_None, rejected) -- rejected lists the
+    selections on locked fixtures as dicts {fid, team, reason}.
+    """
+    index = active_window_index() if index is None else index
+    if not index:
+        return 0, "No fixtures for the active window.", []
 
     match_selections = {}
     for fid, team in selections.items():
-        if fid not in id_to_matchkey:
+        if fid not in index.matchkeys:
             continue
-        key = id_to_matchkey[fid]
-        candidate_ids = matchkey_to_ids.get(key, [fid])
-        canonical = min(candidate_ids,
-                        key=lambda i: fid_to_kickoff.get(
-                            i, datetime.max.replace(tzinfo=UTC)))
-        match_selections[key] = (canonical, team)
-
-    if len(match_selections) + len(existing) > MAX_PICKS_PER_WEEK:
-        return 0, f"Too many picks. You may only have up to {MAX_PICKS_PER_WEEK} picks combining existing and new selections."
-
-    conn = get_conn()
-    c = conn.cursor()
-    week_ids = [r[0] for r in week_rows]
-    if week_ids:
-        placeholders = ",".join("?" * len(week_ids))
-        c.execute(
-            f"DELETE FROM picks WHERE username=? AND fixture_id IN ({placeholders})",
-            tuple([username] + week_ids))
-        conn.commit()
+        # duplicate listings of a game collapse onto the earliest kickoff
+        match_selections[index.matchkeys[fid]] = (index.canonical[fid], team)
 
-    saved_count = 0
-    for key, (fid, team) in match_selections.items():
-        c.execute(
-            "INSERT OR REPLACE INTO picks (username, fixture_id, pick_team) VALUES (?, ?, ?)",
-            (username, fid, team))
-        saved_count += 1
-    conn.commit()
-    conn.close()
-    return saved_count, None
-
-def save_user_additional_picks_for_active_window(username: str, chosen_opts: list):
+    try:
+        # check + replace in one write transaction (no interleaved submit)
+        with db(immediate=True) as conn:
+            return _replace_window_picks(
+                conn, username, match_selections.values(), index)
+    except sqlite3.IntegrityError as e:
+        return 0, _pick_error(e), []
+
+def save_user_picks_for_week(username, selections: dict, index=None):
+    """Picks are saved per active window; see save_user_picks_for_active_window."""
+    return save_user_picks_for_active_window(username, selections, index)
+
+def save_user_additional_picks_for_active_window(username: str, chosen_opts: list,
+                                                 index=None):
     """Append-only save:
     - Does NOT delete or modify existing picks in the active window
     - Ignores any selection that conflicts with a previously picked match
+    - Rejects selections whose fixture is locked (lock_at checked at write time,
+      so options from a page left open past the deadline are safe)
     - Enforces MAX_PICKS_PER_WEEK (existing + new <= MAX)
-    - Assumes chosen_opts are from build_team_options_for_active_window (so already unlocked)
-    Returns: (saved_count, err_or_None)
+    Returns: (saved_count, err_or_None, rejected) -- rejected lists the locked
+    selections as dicts {fid, team, reason}.
     """
-    week_rows = fixtures_for_active_window()
-    if not week_rows:
-        return 0, "No fixtures for the active week."
-
-    # existing picks & matchkeys in this window
-    existing_opts, existing_mks = existing_picks_in_active_window(username)
-
-    # keep only NEW matchkeys that are not already picked
-    new_by_mk = {}
-    for opt in chosen_opts:
-        mk = opt["matchkey"]
-        if mk in existing_mks or mk in new_by_mk:
-            continue
-        new_by_mk[mk] = opt
+    index = active_window_index() if index is None else index
+    if not index:
+        return 0, "No fixtures for the active week.", []
 
-    new_opts = list(new_by_mk.values())
-
-    # enforce MAX (existing + new <= MAX)
-    if len(existing_opts) + len(new_opts) > MAX_PICKS_PER_WEEK:
-        return 0, f"You can only have {MAX_PICKS_PER_WEEK} picks per week. You already have {len(existing_opts)} confirmed."
-
-    # Insert only the new ones
-    if not new_opts:
-        return 0, None
-
-    conn = get_conn()
-    c = conn.cursor()
-    saved = 0
-    for opt in new_opts:
-        # Insert; if user somehow already picked the exact same fixture_id, ignore
-        c.execute(
-            "INSERT OR IGNORE INTO picks (username, fixture_id, pick_team) VALUES (?, ?, ?)",
-            (username, opt["fid"], opt["team"])
-        )
-        # Check if insert happened
-        if c.rowcount > 0:
-            saved += 1
-    conn.commit()
-    conn.close()
-    return saved, None
+    try:
+        # read existing picks, check and insert in one write transaction so
+        # two quick submits (or two tabs) cannot both pass the check
+        with db(immediate=True) as conn:
+            existing_opts, existing_mks = existing_picks_in_active_window(username, index)
+
+            # keep only NEW matchkeys that are not already picked
+            new_by_mk = {}
+            for opt in chosen_opts:
+                mk = opt["matchkey"]
+                if mk in existing_mks or mk in new_by_mk:
+                    continue
+                new_by_mk[mk] = opt
+
+            now = int(time.time())
+            new_picks, rejected = _reject_locked(
+                conn, [(opt["fid"], opt["team"]) for opt in new_by_mk.values()], now)
+
+            # enforce MAX (existing + new <= MAX); the picks_week_cap trigger
+            # backs this up for writers that skip the check
+            if len(existing_opts) + len(new_picks) > MAX_PICKS_PER_WEEK:
+                return 0, f"You can only have {MAX_PICKS_PER_WEEK} picks per week. You already have {len(existing_opts)} confirmed.", rejected
+
+            # Insert only the new ones
+            if not new_picks:
+                return 0, None, rejected
+
+            # Insert with a spread/kickoff snapshot; if user somehow already
+            # picked the exact same fixture_id or game, ignore
+            saved = _insert_picks(conn, username, new_picks, index,
+                                  on_conflict="IGNORE", now=now)
+            refresh_standings([fid for fid, _ in new_picks])
+    except sqlite3.IntegrityError as e:
+        return 0, _pick_error(e), []
+    return saved, None, rejected
 
 # ---------------- Selections summary ----------------
-def selections_summary_for_week():
-    week_rows = fixtures_for_active_window()
-    if not week_rows:
+def selections_summary_for_week(index=None):
+    """Selections per team this window, counted in SQL (GROUP BY pick_team)."""
+    index = active_window_index() if index is None else index
+    if not index:
         return pd.DataFrame(columns=["Team", "Selections"])
-    id_to_names = {r[0]: (r[1], r[2]) for r in week_rows}
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("SELECT fixture_id, pick_team FROM picks")
-    rows = c.fetchall()
-    conn.close()
+    with db() as conn:
+        # covered by idx_picks_week_team
+        return pd.read_sql_query("""
+            SELECT pick_team AS Team, COUNT(*) AS Selections
+            FROM picks
+            WHERE week_id = ?
+            GROUP BY pick_team
+            ORDER BY Selections DESC, Team
+        """, conn, params=(index.week_id, ))
+
+
+def selections_by_fixture(by_matchkey=False, index=None):
+    """
+    Home vs away share of the selections for each fixture of the window.
+    by_matchkey=True merges duplicate listings of the same game (counted
+    by team, on the orientation of the earliest-kickoff listing).
+    """
+    cols = ["Home", "Away", "Home Picks", "Away Picks", "Home %", "Away %"]
+    index = active_window_index() if index is None else index
+    if not index:
+        return pd.DataFrame(columns=cols)
+    with db() as conn:
+        # covered by idx_picks_week_team
+        rows = conn.execute("""
+            SELECT fixture_id, pick_team, pick_side, COUNT(*)
+            FROM picks
+            WHERE week_id = ?
+            GROUP BY fixture_id, pick_team, pick_side
+        """, (index.week_id, )).fetchall()
+
     counts = {}
-    for fid, team in rows:
-        if fid not in id_to_names:
+    for fid, team, side, n in rows:
+        if fid not in index.teams:
             continue
-        counts[team] = counts.get(team, 0) + 1
-    df = pd.DataFrame([{
-        "Team": k,
-        "Selections": v
-    } for k, v in sorted(counts.items(), key=lambda x: -x[1])])
-    return df
+        group = index.canonical[fid] if by_matchkey else fid
+        if group == fid:
+            home_side = side == "home"
+        else:
+            home_side = team.strip().lower() == index.teams[group][0].strip().lower()
+        h, a = counts.get(group, (0, 0))
+        counts[group] = (h + n, a) if home_side else (h, a + n)
+
+    out = []
+    for fid in index.fixture_ids:
+        if by_matchkey and index.canonical[fid] != fid:
+            continue
+        home, away = index.teams[fid]
+        h, a = counts.get(fid, (0, 0))
+        total = h + a
+        out.append({
+            "Home": home, "Away": away, "Home Picks": h, "Away Picks": a,
+            "Home %": round(100.0 * h / total, 1) if total else None,
+            "Away %": round(100.0 * a / total, 1) if total else None,
+        })
+    return pd.DataFrame(out, columns=cols)
 
 
 # ---------------- Results storage ----------------
 def save_result(fixture_id, score_home, score_away):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute(
-        "INSERT OR REPLACE INTO results (fixture_id, score_home, score_away) VALUES (?, ?, ?)",
-        (fixture_id, int(score_home), int(score_away)))
-    conn.commit()
-    conn.close()
+    return save_results([(fixture_id, score_home, score_away)])
+
 
+def save_results(scores):
+    """
+    Bulk upsert of scores [(fixture_id, score_home, score_away[, final]), ...]
+    in one transaction; final defaults to True, False marks a live score
+    that is stored but not scored until it turns final. Rows identical to
+    the stored ones are not written; if a fixture appears twice the last
+    score wins.
+    Returns {"inserted": n, "updated": n, "unchanged": n}.
+    """
+    incoming = {fid: (int(h), int(a), int(bool(final[0])) if final else 1)
+                for fid, h, a, *final in scores}
+    report = {"inserted": 0, "updated": 0, "unchanged": 0}
+    if not incoming:
+        return report
+
+    ids = list(incoming)
+    with db(immediate=True) as conn:
+        current = {
+            r[0]: (r[1], r[2], r[3]) for r in conn.execute(
+                f"""SELECT fixture_id, score_home, score_away, final FROM results
+                    WHERE fixture_id IN ({','.join('?' * len(ids))})""", ids)
+        }
+        changed = []
+        for fid, score in incoming.items():
+            if fid not in current:
+                report["inserted"] += 1
+            elif current[fid] != score:
+                report["updated"] += 1
+            else:
+                report["unchanged"] += 1
+                continue
+            changed.append((fid, ) + score)
 
+        if changed:
+            conn.executemany(
+                "INSERT OR REPLACE INTO results (fixture_id, score_home, score_away, final) VALUES (?, ?, ?, ?)",
+                changed)
+            refresh_standings([row[0] for row in changed])
+            bump_data_version()
+    return report
+
+
+@cached_read
 def load_results_map():
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("SELECT fixture_id, score_home, score_away FROM results")
-    rows = c.fetchall()
-    conn.close()
+    with db() as conn:
+        rows = conn.execute(
+            "SELECT fixture_id, score_home, score_away FROM results").fetchall()
     return {r[0]: (r[1], r[2]) for r in rows}
 
+@cached_read
 def get_active_window():
     """Return (start_utc_dt, end_utc_dt) or (None, None) if not set."""
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("SELECT start_utc, end_utc FROM active_window WHERE id=1")
-    row = c.fetchone()
-    conn.close()
+    with db() as conn:
+        row = conn.execute(
+            "SELECT start_utc, end_utc FROM active_window WHERE id=1").fetchone()
     if not row or not row[0] or not row[1]:
         return None, None
     return safe_parse(row[0]), safe_parse(row[1])
 
 def set_active_window(start_dt_utc, end_dt_utc):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("INSERT OR REPLACE INTO active_window (id, start_utc, end_utc) VALUES (1, ?, ?)",
-              (start_dt_utc.isoformat(), end_dt_utc.isoformat()))
-    conn.commit()
-    conn.close()
+    with db() as conn:
+        conn.execute("INSERT OR REPLACE INTO active_window (id, start_utc, end_utc) VALUES (1, ?, ?)",
+                     (start_dt_utc.isoformat(), end_dt_utc.isoformat()))
+        bump_data_version()
 
 def next_thu_to_next_tue_window(now_utc=None):
     if now_utc is None:
@@ -815,34 +2157,136 @@ def next_thu_to_next_tue_window(now_utc=None):
     return start_local.astimezone(UTC), end_local.astimezone(UTC)
 
 
+def roll_active_window(now_utc=None):
+    """
+    Set the Thu→Tue window if none is set, or move it to the next one once
+    the current window has ended (plus WINDOW_ROLL_GRACE for late scores).
+    """
+    if now_utc is None:
+        now_utc = datetime.now(UTC)
+    start_utc, end_utc = get_active_window()
+    if start_utc and end_utc and now_utc < end_utc + WINDOW_ROLL_GRACE:
+        return start_utc, end_utc
+    start_utc, end_utc = next_thu_to_next_tue_window(now_utc)
+    set_active_window(start_utc, end_utc)
+    return start_utc, end_utc
+
+
 # ---------------- active week  ----------------
 
 def fixtures_for_active_window():
     """
     Return fixtures whose kickoff is within the active window.
     Falls back to current-week heuristic if no window is set.
+    Served from the read cache via get_active_window/load_fixtures_between
+    (the fallback depends on the clock, so it is not memoized as a whole).
     """
     start_utc, end_utc = get_active_window()
-    rows = load_all_fixtures()
-    out = []
     if start_utc and end_utc:
-        for r in rows:
-            ko = safe_parse(r[3])
-            if ko and (start_utc <= ko < end_utc):
-                out.append(r)
-        return out
+        return load_fixtures_between(start_utc, end_utc)
     # fallback to your existing heuristic
     return fixtures_for_current_week()
 
+
+def matchkey(home, away):
+    """Order-independent key for a game, shared by duplicate fixture ids."""
+    return tuple(sorted([home.strip().lower(), away.strip().lower()]))
+
+
+class WindowIndex:
+    """
+    Immutable lookup tables over the fixtures of one window, built once per
+    (window, data version) by active_window_index() and shared by the picks
+    helpers instead of each re-deriving them from the rows:
+      rows         fixture tuples as loaded, kickoff order
+      kickoffs     fid -> parsed kickoff (UTC) or None
+      teams        fid -> (home, away)
+      matchkeys    fid -> matchkey(home, away)
+      matchkey_ids matchkey -> fids of that game, in row order
+      canonical    fid -> earliest-kickoff fid of the same game
+      team_fixture team -> fid (each team plays once per window)
+      lock_at      fid -> time picks close (kickoff - PICK_LOCK_BEFORE) or None
+      week_id      window_week_id(window start), stamped on every pick saved here
+    """
+    __slots__ = ("rows", "kickoffs", "teams", "matchkeys", "matchkey_ids",
+                 "canonical", "team_fixture", "lock_at", "week_id")
+
+    def __init__(self, rows, start_utc=None):
+        never = datetime.max.replace(tzinfo=UTC)
+        kickoffs, teams, matchkeys, matchkey_ids, team_fixture = {}, {}, {}, {}, {}
+        for fid, home, away, kickoff, *_ in rows:
+            kickoffs[fid] = safe_parse(kickoff)
+            teams[fid] = (home, away)
+            key = matchkey(home, away)
+            matchkeys[fid] = key
+            matchkey_ids.setdefault(key, []).append(fid)
+            for team in (home, away):
+                team_fixture.setdefault(team, fid)
+        canonical = {
+            fid: min(matchkey_ids[key], key=lambda i: kickoffs[i] or never)
+            for fid, key in matchkeys.items()
+        }
+        lock_at = {fid: ko - PICK_LOCK_BEFORE if ko else None
+                   for fid, ko in kickoffs.items()}
+        for name, value in (
+                ("rows", tuple(rows)),
+                ("kickoffs", MappingProxyType(kickoffs)),
+                ("teams", MappingProxyType(teams)),
+                ("matchkeys", MappingProxyType(matchkeys)),
+                ("matchkey_ids", MappingProxyType(
+                    {k: tuple(v) for k, v in matchkey_ids.items()})),
+                ("canonical", MappingProxyType(canonical)),
+                ("team_fixture", MappingProxyType(team_fixture)),
+                ("lock_at", MappingProxyType(lock_at)),
+                ("week_id", window_week_id(start_utc) if start_utc else None)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("WindowIndex is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("WindowIndex is immutable")
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def fixture_ids(self):
+        return [r[0] for r in self.rows]
+
+    def is_locked(self, fid, now_utc):
+        lock = self.lock_at.get(fid)
+        return lock is not None and now_utc > lock
+
+
+@cached_read
+def window_index_between(start_utc, end_utc):
+    return WindowIndex(load_fixtures_between(start_utc, end_utc), start_utc)
+
+
+def active_window_index():
+    """
+    WindowIndex of fixtures_for_active_window(), cached per window bounds and
+    data version (the no-window fallback week is re-evaluated each call).
+    """
+    start_utc, end_utc = get_active_window()
+    if not (start_utc and end_utc):
+        wk = week_of_earliest_upcoming()
+        try:
+            start_utc, end_utc = iso_week_bounds(wk) if wk else (None, None)
+        except ValueError:
+            start_utc = end_utc = None
+    if not (start_utc and end_utc):
+        return WindowIndex(())
+    return window_index_between(start_utc, end_utc)
+
 # ---------------- Published results week helpers ----------------
+@cached_read
 def get_published_week():
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute(
-        "SELECT year, week FROM results_week ORDER BY year DESC, week DESC LIMIT 1"
-    )
-    row = c.fetchone()
-    conn.close()
+    with db() as conn:
+        row = conn.execute(
+            "SELECT year, week FROM results_week ORDER BY year DESC, week DESC LIMIT 1"
+        ).fetchone()
     return (row[0], row[1]) if row else None
 
 
@@ -850,13 +2294,11 @@ def set_published_week(year_week_tuple):
     if not year_week_tuple:
         return
     year, week = year_week_tuple
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("DELETE FROM results_week")
-    c.execute("INSERT INTO results_week (year, week) VALUES (?, ?)",
-              (year, week))
-    conn.commit()
-    conn.close()
+    with db() as conn:
+        conn.execute("DELETE FROM results_week")
+        conn.execute("INSERT INTO results_week (year, week) VALUES (?, ?)",
+                     (year, week))
+        bump_data_version()
 
 
 def results_exist_for_published_week():
@@ -874,8 +2316,11 @@ def results_exist_for_published_week():
 def fetch_results_from_espn_for_week():
     """
     Fetch ESPN results for the current ACTIVE WINDOW (Thu 00:00 Dublin → Tue 00:00 Dublin).
-    Saves scores for fixtures whose kickoff is inside that window.
-    Publishes the week corresponding to the window's Thursday.
+    Saves scores for fixtures whose kickoff is inside that window; games ESPN
+    still lists as scheduled (0-0) are skipped. Publishes the week
+    corresponding to the window's Thursday once one of its games is final.
+    Returns (report, err): report is the save_results() counts plus
+    "matched", "final" and "scheduled".
     """
     # Ensure we have an active window; if not, compute & set it
     start_utc, end_utc = get_active_window()
@@ -886,7 +2331,7 @@ def fetch_results_from_espn_for_week():
     # Fixtures to match against = only those in the active window
     window_rows = fixtures_for_active_window()
     if not window_rows:
-        return 0, "No fixtures in the active window. Fetch fixtures first."
+        return None, "No fixtures in the active window. Fetch fixtures first."
 
     # Build a quick list of UTC dates to query on ESPN (inclusive start, exclusive end)
     days = []
@@ -895,14 +2340,19 @@ def fetch_results_from_espn_for_week():
         days.append(d)
         d = d + timedelta(days=1)
 
-    saved = 0
-    for d in days:
-        date_str = d.strftime("%Y%m%d")
-        try:
-            resp = requests.get(ESPN_SCOREBOARD_URL, params={"dates": date_str}, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception:
+    # fetch every day's scoreboard concurrently (bounded), then match in order
+    def fetch_day(d):
+        return http_get_json("espn", ESPN_SCOREBOARD_URL,
+                             {"dates": d.strftime("%Y%m%d")})
+
+    with ThreadPoolExecutor(max_workers=ESPN_MAX_WORKERS) as pool:
+        fetched = list(pool.map(fetch_day, days))
+    log_fetches([log_row for _, log_row in fetched])
+
+    index = build_fixture_match_index(window_rows)
+    matched, final, scheduled = {}, set(), 0
+    for data, _ in fetched:
+        if not isinstance(data, dict):
             continue
 
         events = data.get("events", [])
@@ -912,6 +2362,8 @@ def fetch_results_from_espn_for_week():
                 continue
             comp = comps[0]
             competitors = comp.get("competitors", [])
+            # pre / in / post; completed marks a final score
+            status_type = (ev.get("status") or comp.get("status") or {}).get("type") or {}
             if len(competitors) < 2:
                 continue
 
@@ -924,249 +2376,826 @@ def fetch_results_from_espn_for_week():
                 except Exception:
                     continue
 
-            home_name = (home_comp.get("team", {}) or {}).get("displayName", "") or ""
-            away_name = (away_comp.get("team", {}) or {}).get("displayName", "") or ""
+            home_team = home_comp.get("team", {}) or {}
+            away_team = away_comp.get("team", {}) or {}
             score_home = int(home_comp.get("score") or 0)
             score_away = int(away_comp.get("score") or 0)
+            ev_date = safe_parse(ev.get("date"))
+
+            # O(1) lookup against the active-window fixtures
+            fid, swapped = match_fixture(
+                index,
+                canonical_team(home_team.get("displayName"), home_team.get("id")),
+                canonical_team(away_team.get("displayName"), away_team.get("id")),
+                ev_date.date() if ev_date else None)
+            if fid is None:
+                continue
+            if status_type.get("state") == "pre":
+                # not started: ESPN reports 0-0, which is not a result
+                scheduled += 1
+                continue
+            if swapped:
+                score_home, score_away = score_away, score_home
+            done = bool(status_type.get("completed")
+                        or status_type.get("state") == "post")
+            # a live score is saved with final=0: shown, not scored yet
+            matched[fid] = (fid, score_home, score_away, done)
+            if done:
+                final.add(fid)
+
+    if matched or scheduled:
+        # one transaction for the whole batch; unchanged scores are skipped
+        report = save_results(matched.values())
+        report.update(matched=len(matched), final=len(final), scheduled=scheduled)
+        # ✅ publish the week that corresponds to this window's Thursday,
+        # but only once there is a finished game to show
+        if final:
+            publish_week_from_window(start_utc)
+        return report, None
+
+    return None, "No results matched for the active window."
+
+# ---------------- Interned ids ----------------
+class Interner:
+    """
+    Two-way map between names and the small dense ints of a surrogate key
+    (users.user_id), so bulk data can live in NumPy int columns and be
+    grouped as ints. Seeded with (id, name) pairs; unknown names map to -1.
+    """
+    __slots__ = ("_ids", "_names")
 
-            # Try to match to our fixtures in the active window
-            for r in window_rows:
-                fid, home, away, kickoff, sh, sa = r
-                hn, an = (home or "").lower(), (away or "").lower()
-                hq, aq = home_name.lower(), away_name.lower()
+    def __init__(self, pairs=()):
+        self._ids, self._names = {}, []
+        for i, name in pairs:
+            if i >= len(self._names):
+                self._names.extend([None] * (i + 1 - len(self._names)))
+            self._names[i] = name
+            self._ids[name] = i
 
-                # direct or relaxed match
-                def team_match(a, b):
-                    return (a in b) or (b in a) or any(w in a for w in b.split())
+    def ids(self, names):
+        """int32 array of the ids of a sequence of names (-1 if unknown)."""
+        return np.fromiter((self._ids.get(name, -1) for name in names),
+                           dtype=np.int32, count=len(names))
 
-                if team_match(hq, hn) and team_match(aq, an):
-                    save_result(fid, score_home, score_away)
-                    saved += 1
-                elif team_match(hq, an) and team_match(aq, hn):
-                    save_result(fid, score_away, score_home)
-                    saved += 1
+    def names(self, ids):
+        """Object array of the names behind ids (None for -1 / holes)."""
+        lookup = np.array(self._names + [None], dtype=object)
+        return lookup[np.asarray(ids, dtype=np.int64)]
 
-    if saved > 0:
-        # ✅ publish the week that corresponds to this window's Thursday
-        publish_week_from_window(start_utc)
-        return saved, None
 
-    return 0, "No results matched for the active window."
+@cached_read
+def user_registry():
+    with db() as conn:
+        return Interner(conn.execute("SELECT user_id, username FROM users"))
+
+
+class PickColumns:
+    """
+    Every pick as parallel read-only NumPy columns (one row per pick, -1 for
+    unknown ids) -- what compute_leaderboard_full scores, as ints:
+      user      int32    users.user_id
+      fixture   int32    fixtures.fixture_key
+      side      int8     1 home, 0 away, -1 no snapshot
+      spread_home, spread_away  float64 snapshot (NaN = none; float32 would
+                turn a push into a win/loss on off-grid lines)
+    25 bytes per pick: a 45k-pick season is ~1.1 MB.
+    """
+    __slots__ = ("user", "fixture", "side", "spread_home", "spread_away")
+    _dtypes = (np.int32, np.int32, np.int8, np.float64, np.float64)
+
+    def __init__(self, **columns):
+        for name, dtype in zip(self.__slots__, self._dtypes):
+            arr = np.array(columns[name], dtype=dtype)  # NULL spreads -> NaN
+            arr.flags.writeable = False  # shared through the read cache
+            object.__setattr__(self, name, arr)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PickColumns is immutable")
+
+    def __len__(self):
+        return len(self.user)
+
+
+@cached_read(rev="picks_rev")
+def load_pick_columns(picks_rev):
+    """
+    PickColumns of all picks by registered users, cached per picks_rev
+    (picks_version()). One plain scan of picks;
+    names are turned into ids through the user registry and a fixture-key
+    map in memory rather than by joining users/fixtures on text keys for
+    every pick.
+    """
+    users = user_registry()
+    with db() as conn:
+        fixture_keys = dict(conn.execute("SELECT id, fixture_key FROM fixtures"))
+        cur = conn.execute("""
+            SELECT username, fixture_id,
+                   CASE pick_side WHEN 'home' THEN 1 WHEN 'away' THEN 0 ELSE -1 END,
+                   spread_home, spread_away
+            FROM picks
+        """)
+        chunks = []
+        # converted in chunks so the row tuples never all exist at once
+        for rows in iter(lambda: cur.fetchmany(PICK_COLUMNS_CHUNK), []):
+            username, fixture_id, side, spread_home, spread_away = zip(*rows)
+            user = users.ids(username)
+            fixture = np.fromiter((fixture_keys.get(f, -1) for f in fixture_id),
+                                  dtype=np.int32, count=len(fixture_id))
+            keep = user >= 0
+            chunks.append(dict(
+                user=user[keep], fixture=fixture[keep],
+                side=np.array(side, dtype=np.int8)[keep],
+                spread_home=np.array(spread_home, dtype=float)[keep],
+                spread_away=np.array(spread_away, dtype=float)[keep]))
+
+    return PickColumns(**{
+        name: np.concatenate([c[name] for c in chunks]) if chunks else []
+        for name in PickColumns.__slots__})
+
+
+@cached_read
+def load_result_columns():
+    """
+    Final results as arrays indexed by fixtures.fixture_key:
+    (has_result bool, score_home float, score_away float; NaN = NULL).
+    """
+    with db() as conn:
+        size = conn.execute("SELECT COALESCE(MAX(fixture_key), 0) + 1 FROM fixtures").fetchone()[0]
+        rows = conn.execute("""
+            SELECT f.fixture_key, r.score_home, r.score_away
+            FROM results r JOIN fixtures f ON f.id = r.fixture_id
+            WHERE r.final = 1
+        """).fetchall()
+    has = np.zeros(size, dtype=bool)
+    score_home = np.full(size, np.nan)
+    score_away = np.full(size, np.nan)
+    if rows:
+        keys, sh, sa = (np.array(c, dtype=float) for c in zip(*rows))
+        keys = keys.astype(np.int64)
+        has[keys], score_home[keys], score_away[keys] = True, sh, sa
+    for arr in (has, score_home, score_away):
+        arr.flags.writeable = False
+    return has, score_home, score_away
+
 
 # ---------------- Scoring / Leaderboard (cumulative) ----------------
+NOT_PLAYED = -1  # outcome code: no usable result yet
+
+
+def not_played(score_home, score_away, kickoff_epoch, now_epoch):
+    """
+    Mask of results that are really pre-game zeros: 0-0 with the kickoff
+    still in the future (unknown kickoffs count as played).
+    """
+    with np.errstate(invalid="ignore"):
+        return ((np.asarray(score_home, dtype=float) == 0)
+                & (np.asarray(score_away, dtype=float) == 0)
+                & (np.asarray(kickoff_epoch, dtype=float) > now_epoch))
+
+
+def score_kernel(picked_home, spread_home, spread_away, score_home, score_away,
+                 kickoff_epoch=None, now_epoch=None):
+    """
+    Spread scoring of any number of picks in one NumPy pass over columnar
+    arrays (missing values as NaN/None). A missing spread is inferred from
+    the other side's, missing scores count as 0.
+    Returns int8 outcomes: 3 win, 1 push, 0 loss after applying the spread.
+    With kickoff_epoch/now_epoch, 0-0 results before kickoff are NOT_PLAYED.
+    """
+    sh = np.asarray(spread_home, dtype=float)
+    sa = np.asarray(spread_away, dtype=float)
+    # get spreads, infer counterpart if missing
+    sh, sa = (np.nan_to_num(np.where(np.isnan(sh), -sa, sh)),
+              np.nan_to_num(np.where(np.isnan(sa), -sh, sa)))
+
+    margin = (np.nan_to_num(np.asarray(score_home, dtype=float)) + sh
+              - np.nan_to_num(np.asarray(score_away, dtype=float)) - sa)
+    margin = np.where(np.asarray(picked_home, dtype=bool), margin, -margin)
+    out = (margin > 0).astype(np.int8) * np.int8(3)
+    out[np.abs(margin) < 1e-9] = 1
+    if kickoff_epoch is not None and now_epoch is not None:
+        out[not_played(score_home, score_away, kickoff_epoch, now_epoch)] = NOT_PLAYED
+    return out
+
+
+def _fill_scored_lines(conn, fixture_ids=None):
+    """
+    Score every distinct pick snapshot (fixture, side, spreads, kickoff) that
+    has a final result -- or only those on fixture_ids -- into the connection's
+    temp scored_lines table, tagged with the ISO week of the kickoff snapshot
+    and a hash of all scoring inputs. Reads picks/results only, never
+    fixtures; players who picked the same line share one row, which
+    _SCORED_PICKS_SQL joins back.
+    """
+    sql = """
+        SELECT p.fixture_id, p.pick_side, p.spread_home, p.spread_away,
+               p.kickoff_epoch, r.score_home, r.score_away
+        FROM picks p
+        JOIN results r ON r.fixture_id = p.fixture_id AND r.final = 1
+        WHERE p.pick_side IS NOT NULL
+    """
+    params = ()
+    if fixture_ids is not None:
+        params = tuple(fixture_ids)
+        sql += f" AND p.fixture_id IN ({','.join('?' * len(params))})"
+    sql += " GROUP BY 1, 2, 3, 4, 5"
+    df = pd.read_sql_query(sql, conn, params=params)
+    # leaderboard semantics: no 0-0-before-kickoff rule here
+    pts = score_kernel((df["pick_side"] == "home").to_numpy(),
+                       df["spread_home"].to_numpy(dtype=float, na_value=np.nan),
+                       df["spread_away"].to_numpy(dtype=float, na_value=np.nan),
+                       df["score_home"].to_numpy(dtype=float, na_value=np.nan),
+                       df["score_away"].to_numpy(dtype=float, na_value=np.nan))
+    iso = pd.to_datetime(df["kickoff_epoch"], unit="s", utc=True).dt.isocalendar()
+    # plain Python values (None for NULL) so the hash is stable across batches
+    cols = {
+        col: [None if pd.isna(v) else typ(v) for v in df[col]]
+        for col, typ in (("fixture_id", str), ("pick_side", str),
+                         ("spread_home", float), ("spread_away", float),
+                         ("kickoff_epoch", int), ("score_home", int),
+                         ("score_away", int))
+    }
+    hashes = [
+        hashlib.sha1(repr(inputs).encode()).hexdigest()[:16]
+        for inputs in zip(*(cols[c] for c in ("pick_side", "spread_home", "spread_away",
+                                              "kickoff_epoch", "score_home", "score_away")))
+    ]
+
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS scored_lines (
+            fixture_id TEXT,
+            pick_side TEXT,
+            spread_home REAL,
+            spread_away REAL,
+            kickoff_epoch INTEGER,
+            year INTEGER,
+            week INTEGER,
+            pts INTEGER,
+            input_hash TEXT
+        )
+    """)
+    conn.execute("DELETE FROM scored_lines")
+    conn.executemany(
+        "INSERT INTO scored_lines VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        zip(cols["fixture_id"], cols["pick_side"], cols["spread_home"],
+            cols["spread_away"], cols["kickoff_epoch"],
+            iso["year"].fillna(0).astype(int).tolist(),
+            iso["week"].fillna(0).astype(int).tolist(), pts.tolist(), hashes))
+
+
+# picks joined to their scored line (NULL-safe on the snapshot columns);
+# lines drive the join through idx_picks_fixture (the unary + keeps the
+# planner off the kickoff index) so a few new results only touch their picks
+_SCORED_PICKS_SQL = """
+    SELECT p.username, p.fixture_id, sl.year, sl.week, sl.pts, sl.input_hash
+    FROM scored_lines sl
+    CROSS JOIN picks p
+      ON p.fixture_id = sl.fixture_id AND p.pick_side = sl.pick_side
+     AND p.spread_home IS sl.spread_home AND p.spread_away IS sl.spread_away
+     AND +p.kickoff_epoch IS sl.kickoff_epoch
+"""
+
+
+def compute_leaderboard_full():
+    """
+    Recompute the cumulative leaderboard straight from picks/results
+    (same columns as compute_leaderboard). Used to verify the standings table,
+    so it deliberately shares nothing with it but score_kernel: picks and
+    results are scored as interned int columns and summed per user id.
+    """
+    with db() as conn:
+        players = conn.execute(
+            "SELECT user_id FROM users WHERE is_admin = 0 ORDER BY user_id").fetchall()
+    if not players:
+        return pd.DataFrame(columns=["Player", "Points", "Played"])
+    player_ids = np.array([r[0] for r in players], dtype=np.int64)
+
+    cols = load_pick_columns(picks_version())
+    has_result, score_home, score_away = load_result_columns()
+    fixture = cols.fixture.astype(np.int64)
+    scored = (cols.side >= 0) & (fixture >= 0)
+    scored[scored] = has_result[fixture[scored]]
+    fixture = fixture[scored]
+    # leaderboard semantics: no 0-0-before-kickoff rule here
+    pts = score_kernel(cols.side[scored] == 1, cols.spread_home[scored],
+                       cols.spread_away[scored], score_home[fixture],
+                       score_away[fixture])
+    size = int(player_ids.max()) + 1
+    user = cols.user[scored].astype(np.int64)
+    keep = user < size
+    points = np.bincount(user[keep], weights=pts[keep], minlength=size)
+    played = np.bincount(user[keep], minlength=size)
+
+    df = pd.DataFrame({"Player": user_registry().names(player_ids),
+                       "Points": points[player_ids].astype(np.int64),
+                       "Played": played[player_ids].astype(np.int64)})
+    df = df.sort_values("Points", ascending=False, kind="stable")
+    return df.reset_index(drop=True)
+
+
 def compute_leaderboard():
     """
     Cumulative leaderboard across the whole session.
     - 3 pts for win after applying spread
     - 1 pt for push (adjusted tie)
     - 0 pts for loss
-    Only fixtures with results in the 'results' table count towards points.
+    Only fixtures with a final result in the 'results' table count towards points.
     Returns a pandas DataFrame sorted by Points desc.
-    """
-    conn = get_conn()
-    c = conn.cursor()
-
-    # get non-admin players
-    c.execute("SELECT username FROM users WHERE is_admin=0")
-    players = [r[0] for r in c.fetchall()]
-
-    # load fixtures (teams + spreads)
-    c.execute("SELECT id, home, away, spread_home, spread_away FROM fixtures")
-    fixtures_rows = c.fetchall()
-    fixtures = {}
-    for fid, home, away, sh, sa in fixtures_rows:
-        fixtures[fid] = {"home": home, "away": away, "sh": sh, "sa": sa}
 
-    # load results (source of truth for finished games)
-    c.execute("SELECT fixture_id, score_home, score_away FROM results")
-    results_rows = c.fetchall()
-    results = {r[0]: (r[1], r[2]) for r in results_rows}
+    Reads the materialized standings table, kept current by refresh_standings().
+    """
+    with db() as conn:
+        df = pd.read_sql_query("""
+            SELECT u.username AS Player,
+                   COALESCE(SUM(s.points), 0) AS Points,
+                   COALESCE(SUM(s.played), 0) AS Played
+            FROM users u
+            LEFT JOIN standings s ON s.username = u.username
+            WHERE u.is_admin = 0
+            GROUP BY u.username
+            ORDER BY MIN(u.rowid)
+        """, conn)
 
-    conn.close()
+    if df.empty:
+        return pd.DataFrame(columns=["Player", "Points", "Played"])
+    df = df.sort_values("Points", ascending=False, kind="stable")
+    return df.reset_index(drop=True)
 
-    leaderboard = []
-    for player in players:
-        conn = get_conn()
-        c = conn.cursor()
-        c.execute("SELECT fixture_id, pick_team FROM picks WHERE username=?",
-                  (player, ))
-        picks = c.fetchall()
-        conn.close()
-
-        total_points = 0
-        played_count = 0
-        for fid, pick_team in picks:
-            # pick must reference a known fixture and there must be a result saved
-            if fid not in fixtures or fid not in results:
-                continue
 
-            f = fixtures[fid]
-            score_home, score_away = results[fid]
+# ---------------- Standings (materialized leaderboard) ----------------
+def refresh_pick_outcomes(conn, fixture_ids=None):
+    """
+    Bring pick_outcomes up to date for picks on fixture_ids (None = all):
+    rows whose input hash is unchanged are left alone, picks that are gone
+    (or have no final result any more) are dropped. Returns the ISO weeks touched.
+    """
+    if fixture_ids is not None and not fixture_ids:
+        return set()
+    where, params = "", ()
+    if fixture_ids is not None:
+        params = tuple(fixture_ids)
+        where = f"WHERE fixture_id IN ({','.join('?' * len(params))})"
+    weeks = set(conn.execute(
+        f"SELECT DISTINCT year, week FROM pick_outcomes {where}", params).fetchall())
+
+    _fill_scored_lines(conn, fixture_ids)
+    conn.execute(f"""
+        INSERT INTO pick_outcomes (username, fixture_id, year, week, pts, input_hash)
+        SELECT username, fixture_id, year, week, pts, input_hash
+        FROM ({_SCORED_PICKS_SQL}) WHERE true
+        ON CONFLICT(username, fixture_id) DO UPDATE SET
+          year=excluded.year,
+          week=excluded.week,
+          pts=excluded.pts,
+          input_hash=excluded.input_hash
+        WHERE pick_outcomes.input_hash != excluded.input_hash
+    """)
+    conn.execute(f"""
+        DELETE FROM pick_outcomes
+        {where + ' AND' if where else 'WHERE'} NOT EXISTS (
+            SELECT 1 FROM picks p
+            JOIN results r ON r.fixture_id = p.fixture_id AND r.final = 1
+            WHERE p.username = pick_outcomes.username
+              AND p.fixture_id = pick_outcomes.fixture_id
+              AND p.pick_side IS NOT NULL)
+    """, params)
+
+    weeks |= set(conn.execute(
+        f"SELECT DISTINCT year, week FROM pick_outcomes {where}", params).fetchall())
+    return weeks
+
+
+def refresh_standings(fixture_ids=None, weeks=()):
+    """
+    Rescore picks on fixture_ids into pick_outcomes and recompute standings
+    for the ISO weeks (of the picks' kickoff snapshots) that touches, plus
+    any extra weeks. Only picks with a final result matter.
+    fixture_ids=None rescores everything and rebuilds the whole table.
+    """
+    with db() as conn:
+        if fixture_ids is None:
+            conn.execute("DELETE FROM pick_outcomes")
+            refresh_pick_outcomes(conn)
+            conn.execute("DELETE FROM standings")
+            weeks = None
+        else:
+            weeks = set(weeks) | refresh_pick_outcomes(conn, list(fixture_ids))
+            if not weeks:
+                bump_picks_version(conn)
+                return
+            conn.executemany("DELETE FROM standings WHERE year=? AND week=?",
+                             sorted(weeks))
+
+        sql = """
+            INSERT INTO standings
+                (username, year, week, points, played, wins, pushes, losses)
+            SELECT username, year, week, SUM(pts), COUNT(*),
+                   SUM(pts = 3), SUM(pts = 1), SUM(pts = 0)
+            FROM pick_outcomes
+        """
+        if weeks is None:
+            conn.execute(sql + " GROUP BY username, year, week")
+        else:
+            conn.executemany(
+                sql + " WHERE year=? AND week=? GROUP BY username, year, week",
+                sorted(weeks))
+        bump_picks_version(conn)
 
-            # get spreads, infer counterpart if missing
-            sh, sa = f.get("sh"), f.get("sa")
-            if sh is None and sa is not None:
-                sh = -sa
-            if sa is None and sh is not None:
-                sa = -sh
 
-            # compute adjusted scores using spread for the selected team
-            if pick_team == f["home"]:
-                adj_sel = (score_home or 0) + (sh or 0)
-                adj_opp = (score_away or 0) + (sa or 0)
-            else:
-                adj_sel = (score_away or 0) + (sa or 0)
-                adj_opp = (score_home or 0) + (sh or 0)
+def rebuild_standings():
+    """
+    Regenerate the standings table from scratch and check it against a full
+    recomputation. Returns a DataFrame of mismatching players (empty = OK).
+    """
+    refresh_standings()
+    fast = compute_leaderboard()
+    full = compute_leaderboard_full()
+    merged = fast.merge(full, on="Player", how="outer",
+                        suffixes=(" (standings)", " (full)"))
+    diff = ((merged["Points (standings)"] != merged["Points (full)"])
+            | (merged["Played (standings)"] != merged["Played (full)"]))
+    return merged[diff].reset_index(drop=True)
 
-            if adj_sel > adj_opp:
-                total_points += 3
-            elif abs(adj_sel - adj_opp) < 1e-9:
-                total_points += 1
-            # else 0
 
-            played_count += 1
+# ---------------- Results view table ----------------
+RESULTS_TABLE_CSS = """
+<style>
+.results-grid { border-collapse: collapse; width: 100%; }
+.results-grid th, .results-grid td { border: 1px solid #e0e0e0; padding: 4px 8px; text-align: left; }
+.results-grid td.win { background-color: #b7eb8f; }
+.results-grid td.push { background-color: #fff59d; }
+.results-grid td.loss { background-color: #f7a8a8; }
+</style>
+"""
+
+
+def unplayed_fixtures(week_rows):
+    """Ids of week fixtures whose result is a pre-game 0-0 (kickoff still ahead)."""
+    results_map = load_results_map()
+    scored = [r for r in week_rows if r[0] in results_map]
+    if not scored:
+        return ()
+    ko = [kickoff_epoch(r[3]) for r in scored]
+    mask = not_played([results_map[r[0]][0] for r in scored],
+                      [results_map[r[0]][1] for r in scored],
+                      [np.nan if k is None else k for k in ko], time.time())
+    return tuple(sorted(r[0] for r, m in zip(scored, mask) if m))
+
+
+@cached_read(rev="picks_rev")
+def results_grid(week, unplayed, picks_rev):
+    """
+    One row per non-admin player: Player, Pick 1..N (kickoff order) and
+    Outcome 1..N (3/1/0, None = no result yet or fixture in unplayed).
+    None if there are no players. picks_rev (picks_version()) only keys
+    the cache, so a pick save shows up without a data version bump.
+    """
+    start, end = iso_week_bounds(week)
+    # every non-admin player with their picks of the week (one row per pick,
+    # or a single empty row), scored outcome and result -- in one query
+    with db() as conn:
+        grid = pd.read_sql_query("""
+            SELECT u.username AS player, wp.fixture_id, wp.pick_team,
+                   wp.pts, wp.has_result
+            FROM users u
+            LEFT JOIN (
+                SELECT p.username, p.fixture_id, p.pick_team, f.kickoff_epoch,
+                       o.pts, r.fixture_id IS NOT NULL AS has_result
+                FROM fixtures f
+                JOIN picks p ON p.fixture_id = f.id
+                LEFT JOIN results r ON r.fixture_id = f.id
+                LEFT JOIN pick_outcomes o
+                  ON o.username = p.username AND o.fixture_id = p.fixture_id
+                WHERE f.kickoff_epoch >= ? AND f.kickoff_epoch < ?
+            ) wp ON wp.username = u.username
+            WHERE u.is_admin = 0
+            ORDER BY u.rowid, wp.kickoff_epoch, wp.fixture_id
+        """, conn, params=(int(start.timestamp()), int(end.timestamp())))
+
+    if grid.empty:
+        return None
+    players = grid["player"].drop_duplicates()
+    scored = (grid["has_result"] == 1) & ~grid["fixture_id"].isin(unplayed)
+    grid["outcome"] = grid["pts"].where(scored & grid["pts"].notna())
+
+    # Pick 1..N in kickoff order
+    picks = grid[grid["fixture_id"].notna()].copy()
+    picks["slot"] = picks.groupby("player", sort=False).cumcount() + 1
+    picks = picks[picks["slot"] <= MAX_PICKS_PER_WEEK]
+    slots = range(1, MAX_PICKS_PER_WEEK + 1)
+    teams = picks.pivot(index="player", columns="slot", values="pick_team") \
+        .reindex(index=players, columns=slots).fillna("")
+    outcomes = picks.pivot(index="player", columns="slot", values="outcome") \
+        .reindex(index=players, columns=slots).astype(object)
+    outcomes = outcomes.where(outcomes.notna(), None)
+
+    df = pd.DataFrame({"Player": players.to_numpy()})
+    for idx in slots:
+        df[f"Pick {idx}"] = teams[idx].to_numpy()
+        df[f"Outcome {idx}"] = [None if o is None else int(o)
+                                for o in outcomes[idx]]
+    return df
 
-        leaderboard.append({
-            "Player": player,
-            "Points": total_points,
-            "Played": played_count
-        })
 
-    df = pd.DataFrame(leaderboard)
-    if df.empty:
-        return pd.DataFrame(columns=["Player", "Points", "Played"])
-    df = df.sort_values("Points", ascending=False).reset_index(drop=True)
-    return df
+@cached_read(rev="picks_rev")
+def results_table_html(week, unplayed, picks_rev, page, page_size):
+    """
+    Colored results table for one page of players as HTML: each pick cell
+    gets a win/push/loss CSS class from its outcome (see RESULTS_TABLE_CSS).
+    """
+    df = results_grid(week, unplayed, picks_rev)
+    if df is None:
+        return ""
+    df = df.iloc[page * page_size:(page + 1) * page_size]
+    slots = range(1, MAX_PICKS_PER_WEEK + 1)
+    css_class = np.array(["", "loss", "push", "", "win", ""])  # by outcome + 1
+    columns = [["<td>%s</td>" % html.escape(str(p)) for p in df["Player"]]]
+    for idx in slots:
+        outcome = df[f"Outcome {idx}"].to_numpy(dtype=float, na_value=np.nan)
+        classes = css_class[np.nan_to_num(outcome, nan=4).astype(int) + 1]
+        columns.append([
+            f'<td class="{c}">{html.escape(str(t))}</td>' if c
+            else f"<td>{html.escape(str(t))}</td>"
+            for c, t in zip(classes, df[f"Pick {idx}"])
+        ])
+    header = "".join(f"<th>{col}</th>"
+                     for col in ["Player"] + [f"Pick {i}" for i in slots])
+    body = "\n".join("<tr>" + "".join(cells) + "</tr>" for cells in zip(*columns))
+    return (f'{RESULTS_TABLE_CSS}<table class="results-grid">'
+            f"<thead><tr>{header}</tr></thead>\n<tbody>\n{body}\n</tbody></table>")
 
 
-# ---------------- Results view table ----------------
-def build_results_table(for_admin: bool = False):
+def build_results_table(for_admin: bool = False, page: int = 0,
+                        page_size: int = RESULTS_PAGE_SIZE):
     """
     If for_admin True:
        - show current-week fixtures if no published_week exists (plain)
        - otherwise show published_week colored table
     If for_admin False:
        - show only published_week (colored) — otherwise return None
-    Returns: display_df, styler_or_None
+    Returns: display_df, html_or_None (colored table, one page of players)
     """
     pub = get_published_week()
     if for_admin:
-        week_rows = fixtures_for_week(
-            pub) if pub else fixtures_for_current_week()
+        week = pub if pub else week_of_earliest_upcoming()
         color = bool(pub)
     else:
         if not pub:
             return None, None
-        week_rows = fixtures_for_week(pub)
+        week = pub
         color = True
 
+    week_rows = fixtures_for_week(week)
     if not week_rows:
         return None, None
+    unplayed = unplayed_fixtures(week_rows)
+    picks_rev = picks_version()
+    df = results_grid(week, unplayed, picks_rev)
+    if df is None:
+        return None, None
 
-    # map fid -> metadata
-    fid_map = {
-        r[0]: (r[1], r[2], safe_parse(r[3]), r[4], r[5])
-        for r in week_rows
-    }
-    results_map = load_results_map()
+    display_df = df[[c for c in df.columns if not c.startswith("Outcome ")]]
+    if not color:
+        # return plain dataframe (no styling)
+        return display_df, None
+    return display_df, results_table_html(week, unplayed, picks_rev, page, page_size)
 
-    # players (non-admin)
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("SELECT username FROM users WHERE is_admin=0")
-    players = [r[0] for r in c.fetchall()]
-    conn.close()
 
-    rows = []
-    now = datetime.now(UTC)
- 
-    for player in players:
-        conn = get_conn()
-        c = conn.cursor()
-        c.execute("SELECT fixture_id, pick_team FROM picks WHERE username=?",
-                  (player, ))
-        raw = c.fetchall()
-        conn.close()
+# ---------------- Background polling ----------------
+def poll_fixtures_job():
+    fixtures = fetch_fixtures_from_oddsapi()
+    report = save_fixtures(fixtures)
+    start_utc, end_utc = roll_active_window()
+    start_dub = start_utc.astimezone(DUBLIN_TZ).strftime("%a %d %b %H:%M")
+    end_dub = end_utc.astimezone(DUBLIN_TZ).strftime("%a %d %b %H:%M")
+    return (f"Fetched {len(fixtures)} fixtures: {len(report['new'])} new, "
+            f"{len(report['spread_moved'])} spread moves, "
+            f"{len(report['kickoff_changed'])} kickoff changes, "
+            f"{len(report['unchanged'])} unchanged. "
+            f"Active window: {start_dub} → {end_dub} (Dublin).")
 
-        picks = [(fid, team, fid_map[fid][2]) for fid, team in raw
-                 if fid in fid_map]
-        picks_sorted = sorted(
-            picks, key=lambda x: x[2] or datetime.max.replace(tzinfo=UTC))
 
-        cells = []
-        for i in range(MAX_PICKS_PER_WEEK):
-            if i < len(picks_sorted):
-                fid, team, kickoff = picks_sorted[i]
-                if fid in results_map:
-                    score_home, score_away = results_map[fid]
-                    # if results exist but appear to be pre-game zeros and kickoff in future -> treat as not played
-                    if (score_home == 0
-                            and score_away == 0) and kickoff and kickoff > now:
-                        cells.append((team, None))
-                    else:
-                        sh, sa = fid_map[fid][3], fid_map[fid][4]
-                        if sh is None and sa is not None:
-                            sh = -sa
-                        if sa is None and sh is not None:
-                            sa = -sh
-                        if team == fid_map[fid][0]:
-                            adj_sel = score_home + (sh or 0)
-                            adj_opp = score_away + (sa or 0)
-                        else:
-                            adj_sel = score_away + (sa or 0)
-                            adj_opp = score_home + (sh or 0)
-                        if adj_sel > adj_opp:
-                            outcome = 3
-                        elif abs(adj_sel - adj_opp) < 1e-9:
-                            outcome = 1
-                        else:
-                            outcome = 0
-                        cells.append((team, outcome))
-                else:
-                    cells.append((team, None))
-            else:
-                cells.append(("", None))
+def poll_scores_job():
+    report, err = fetch_results_from_espn_for_week()
+    if err:
+        raise RuntimeError(err)
+    return (f"Matched {report['matched']} games ({report['final']} final, "
+            f"{report['scheduled']} not started): {report['inserted']} new, "
+            f"{report['updated']} updated, {report['unchanged']} unchanged.")
 
-        row = {"Player": player}
-        for idx, (team, outcome) in enumerate(cells, start=1):
-            row[f"Pick {idx}"] = team
-            row[f"Outcome {idx}"] = outcome
-        rows.append(row)
 
-    df = pd.DataFrame(rows)
-    if df.empty:
-        return None, None
+POLL_JOBS = {"fixtures": poll_fixtures_job, "scores": poll_scores_job}
 
-    display_cols = [c for c in df.columns if not c.startswith("Outcome ")]
-    display_df = df[display_cols].copy()
 
-    if not color:
-        # return plain dataframe (no styling)
-        return display_df, None
+def games_live(now_utc=None):
+    """True if any fixture kicks off soon or may still be in progress."""
+    if now_utc is None:
+        now_utc = datetime.now(UTC)
+    with db() as conn:
+        row = conn.execute(
+            "SELECT 1 FROM fixtures WHERE kickoff_epoch BETWEEN ? AND ? LIMIT 1",
+            (int((now_utc - POLL_LIVE_AFTER).timestamp()),
+             int((now_utc + POLL_LIVE_BEFORE).timestamp()))).fetchone()
+    return row is not None
 
-    # build styler
-    def outcome_color(val, outcome):
-        if outcome == 3:
-            return "background-color: #b7eb8f"
-        elif outcome == 1:
-            return "background-color: #fff59d"
-        elif outcome == 0:
-            return "background-color: #f7a8a8"
-        else:
-            return ""
 
-    styler = display_df.style
-    for idx in range(1, MAX_PICKS_PER_WEEK + 1):
-        col = f"Pick {idx}"
-        outcomes = df[f"Outcome {idx}"]
-        # apply mapping column-wise
-        styler = styler.apply(
-            lambda s, outcomes=outcomes:
-            [outcome_color(v, o) for v, o in zip(s, outcomes)],
-            axis=0,
-            subset=[col])
+def acquire_poll_lease(job, owner):
+    """Single-flight lock shared by every session and process (expiring lease)."""
+    now = int(time.time())
+    with db(immediate=True) as conn:
+        row = conn.execute("SELECT owner, expires_at FROM poll_lease WHERE job=?",
+                           (job, )).fetchone()
+        if row and row[0] != owner and row[1] > now:
+            return False
+        conn.execute(
+            "INSERT OR REPLACE INTO poll_lease (job, owner, expires_at) VALUES (?, ?, ?)",
+            (job, owner, now + POLL_LEASE_SECONDS))
+    return True
+
+
+def release_poll_lease(job, owner):
+    with db() as conn:
+        conn.execute("DELETE FROM poll_lease WHERE job=? AND owner=?",
+                     (job, owner))
+
+
+def request_poll(job):
+    """Ask whichever poller is running (in-app or --worker) to run job now."""
+    with db() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO poll_requests (job, requested_at) VALUES (?, ?)",
+            (job, datetime.now(UTC).isoformat()))
+
+
+def take_poll_requests():
+    with db(immediate=True) as conn:
+        jobs = {r[0] for r in conn.execute("SELECT job FROM poll_requests")}
+        conn.execute("DELETE FROM poll_requests")
+    return jobs
+
 
-    return display_df, styler
+def last_poll_started(job):
+    with db() as conn:
+        row = conn.execute("SELECT MAX(started_at) FROM poll_runs WHERE job=?",
+                           (job, )).fetchone()
+    return safe_parse(row[0]) if row else None
+
+
+def run_poll_job(job, owner, still_due=None):
+    """
+    Run one job under its lease and record the run. Returns False if another
+    poller holds it, or if still_due(job) -- checked once the lease is held --
+    says another poller has run it since the caller looked.
+    The run is recorded before the lease is released, so the next holder
+    always sees it in poll_runs.
+    """
+    if not acquire_poll_lease(job, owner):
+        return False
+    try:
+        if still_due is not None and not still_due(job):
+            return False
+        started_at = datetime.now(UTC)
+        t0 = time.perf_counter()
+        try:
+            detail, status = POLL_JOBS[job](), "ok"
+        except Exception as e:
+            detail, status = str(e), "error"
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        with db() as conn:
+            conn.execute(
+                "INSERT INTO poll_runs (job, started_at, finished_at, elapsed_ms, status, detail) VALUES (?, ?, ?, ?, ?, ?)",
+                (job, started_at.isoformat(), datetime.now(UTC).isoformat(),
+                 round(elapsed_ms, 1), status, detail))
+    finally:
+        release_poll_lease(job, owner)
+    return True
+
+
+def latest_poll_runs(job, limit=10):
+    """Most recent poll_runs rows for a job as a DataFrame (newest first)."""
+    with db() as conn:
+        return pd.read_sql_query(
+            """SELECT started_at AS "Started (UTC)", elapsed_ms AS "ms",
+                      status AS Status, detail AS Detail
+               FROM poll_runs WHERE job=?
+               ORDER BY started_at DESC LIMIT ?""",
+            conn, params=(job, limit))
+
+
+class PollScheduler:
+    """
+    Polls the Odds API and ESPN on POLL_INTERVALS: the live cadence while
+    games are on or about to start, the idle one otherwise. Due times come
+    from poll_runs, so several app processes or a `--worker` share one
+    schedule, and the poll_lease makes sure only one of them fetches at a time.
+    """
+
+    def __init__(self):
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever,
+                                            name="nfl-picks-poller",
+                                            daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        """Run the next tick now instead of waiting out POLL_TICK_SECONDS."""
+        self._wake.set()
+
+    def is_due(self, job, now_utc=None, live=None):
+        if now_utc is None:
+            now_utc = datetime.now(UTC)
+        if live is None:
+            live = games_live(now_utc)
+        live_s, idle_s = POLL_INTERVALS[job]
+        last = last_poll_started(job)
+        return (last is None
+                or now_utc - last >= timedelta(seconds=live_s if live else idle_s))
+
+    def due_jobs(self, now_utc):
+        live = games_live(now_utc)
+        return [job for job in POLL_INTERVALS if self.is_due(job, now_utc, live)]
+
+    def tick(self):
+        requested = take_poll_requests() & set(POLL_JOBS)
+        for job in sorted(requested | set(self.due_jobs(datetime.now(UTC)))):
+            # a scheduled run is re-checked under the lease: another poller
+            # may have run the job since due_jobs() looked
+            run_poll_job(job, self.owner,
+                         None if job in requested else self.is_due)
+
+    def run_forever(self):
+        while True:
+            try:
+                self.tick()
+            except Exception:
+                # keep polling; the next tick retries
+                pass
+            self._wake.wait(POLL_TICK_SECONDS)
+            self._wake.clear()
+
+
+@st.cache_resource
+def _poll_scheduler(path):
+    scheduler = PollScheduler()
+    if RUN_POLLER_IN_APP:
+        scheduler.start()
+    return scheduler
+
+
+def run_worker():
+    """Standalone poller: `python nfl_picks.py --worker`."""
+    _db_initialized(DB_FILE)
+    PollScheduler().run_forever()
+
+
+def show_poll_status(job, title):
+    """Read-only admin view of the poller's latest runs for one job."""
+    runs = latest_poll_runs(job)
+    live_s, idle_s = POLL_INTERVALS[job]
+    cadence = live_s if games_live() else idle_s
+    st.subheader(title)
+    if runs.empty:
+        st.info("The background poller has not run this job yet.")
+    else:
+        last = runs.iloc[0]
+        msg = f"Last run {last['Started (UTC)'][:19]} UTC ({last['ms']:.0f} ms): {last['Detail']}"
+        (st.success if last["Status"] == "ok" else st.error)(msg)
+    st.caption(f"Polling every {cadence // 60} min right now.")
+    if st.button("Poll now", key=f"poll_now_{job}"):
+        request_poll(job)
+        _poll_scheduler(DB_FILE).wake()
+        st.info("Requested — the poller will pick it up within a few seconds.")
+    with st.expander("Recent runs"):
+        st.dataframe(runs, use_container_width=True)
+
+
+def show_results_table(for_admin):
+    """Results grid, paged when the pool is large. False if nothing to show."""
+    display_df, table_html = build_results_table(for_admin=for_admin)
+    if display_df is None:
+        return False
+    st.write(
+        "Colors: green = win (3 pts), yellow = push (1 pt), red = loss (0 pts), white = not played"
+    )
+    if table_html is None:
+        st.dataframe(display_df, use_container_width=True)
+        return True
+    n_pages = max(1, -(-len(display_df) // RESULTS_PAGE_SIZE))
+    if n_pages > 1:
+        page = st.number_input(f"Page (of {n_pages})", min_value=1,
+                               max_value=n_pages, value=1,
+                               key=f"results_page_{for_admin}") - 1
+        first = page * RESULTS_PAGE_SIZE
+        st.caption(f"Players {first + 1}–{min(first + RESULTS_PAGE_SIZE, len(display_df))} "
+                   f"of {len(display_df)}")
+        _, table_html = build_results_table(for_admin=for_admin, page=page)
+    st.write(table_html, unsafe_allow_html=True)
+    return True
 
 
 # ---------------- Streamlit UI ----------------
@@ -1174,7 +3203,8 @@ st.set_page_config(page_title="NFL Picks (Fixed)", layout="wide")
 
 
 def main():
-    init_db()
+    _db_initialized(DB_FILE)
+    _poll_scheduler(DB_FILE)
 
     # session defaults
     if "authenticated" not in st.session_state:
@@ -1263,34 +3293,40 @@ def main():
     if admin_flag and page == "Fixtures":
         st.header("Admin — Fixtures")
 
-        if st.button("Fetch Fixtures from Odds API", key="admin_fetch_fixtures"):
-            fixtures = fetch_fixtures_from_oddsapi()
-            saved = save_fixtures(fixtures)
-
-            # Set the active window to Thu -> next Tue (Dublin)
-            start_utc, end_utc = next_thu_to_next_tue_window()
-            set_active_window(start_utc, end_utc)
-
-            # Nice message with Dublin-local times
-            start_dub = start_utc.astimezone(DUBLIN_TZ).strftime("%a %d %b %H:%M")
-            end_dub = end_utc.astimezone(DUBLIN_TZ).strftime("%a %d %b %H:%M")
-            st.success(
-                f"Fetched {len(fixtures)} fixtures, saved/updated {saved}. "
-                f"Active window set: **{start_dub} → {end_dub} (Dublin)**."
-            )
+        # fetching runs in the background poller; this page only shows status
+        show_poll_status("fixtures", "Odds API polling")
+        quota = odds_quota()
+        if quota:
+            st.caption(f"Odds API quota: {quota[0]} requests left ({quota[1]} used).")
 
         # Show ONLY active-window fixtures
         st.subheader("Active window fixtures (Thu → next Tue)")
         active_rows = fixtures_for_active_window()
         if active_rows:
+            df_active = fixtures_to_dataframe(active_rows)
+            stats = spread_stats([r[0] for r in active_rows])
+            df_active["Books"] = df_active["FixtureID"].map(
+                lambda fid: stats.get(fid, (None, None))[0])
+            df_active["Spread Std Dev"] = df_active["FixtureID"].map(
+                lambda fid: stats.get(fid, (None, None))[1])
             st.dataframe(
-                fixtures_to_dataframe(active_rows)[
-                    ["Home", "Away", "Kickoff (Dublin)", "Spread Home", "Spread Away"]
+                df_active[
+                    ["Home", "Away", "Kickoff (Dublin)", "Spread Home", "Spread Away",
+                     "Books", "Spread Std Dev"]
                 ],
                 use_container_width=True
             )
+            with st.expander("Line movement"):
+                labels = {r[0]: f"{r[2]} @ {r[1]}" for r in active_rows}
+                fid = st.selectbox("Fixture", list(labels),
+                                   format_func=labels.get, key="line_movement_fixture")
+                df_hist = load_spread_history(fid)
+                if len(df_hist) > 1:
+                    st.line_chart(df_hist.set_index("Observed (UTC)")["Spread Home"])
+                st.dataframe(df_hist[["Observed (UTC)", "Spread Home", "Spread Away", "Source"]],
+                             use_container_width=True)
         else:
-            st.info("No fixtures in the active window. Click 'Fetch Fixtures'.")
+            st.info("No fixtures in the active window yet. Use 'Poll now' or wait for the poller.")
 
     # --- Admin: Selections Summary ---
     if admin_flag and page == "Selections Summary":
@@ -1300,10 +3336,22 @@ def main():
             st.info("No selections for this week yet.")
         else:
             st.dataframe(df_sum, use_container_width=True)
+            st.subheader("By game")
+            merge = st.checkbox("Merge duplicate listings of the same game",
+                                key="admin_sel_by_matchkey")
+            st.dataframe(selections_by_fixture(by_matchkey=merge),
+                         use_container_width=True)
 
     # --- Admin: Leaderboard ---
     if admin_flag and page == "Leaderboard":
         st.header("Admin — Leaderboard (cumulative)")
+        if st.button("Rebuild standings", key="admin_rebuild_standings"):
+            mismatches = rebuild_standings()
+            if mismatches.empty:
+                st.success("Standings rebuilt and verified against a full recomputation.")
+            else:
+                st.error(f"Standings rebuilt but {len(mismatches)} player(s) differ from the full recomputation.")
+                st.dataframe(mismatches, use_container_width=True)
         df_lb = compute_leaderboard()
         if df_lb.empty:
             st.info("No leaderboard data yet (no results or picks).")
@@ -1335,7 +3383,8 @@ def main():
     if (not admin_flag) and page == "My Picks":
         st.header("My Picks — select exactly 5 for the active week")
         # 1) Show the fixtures table for the active window (Thu→Tue)
-        week_rows = fixtures_for_active_window()
+        index = active_window_index()  # one cached lookup shared by all helpers below
+        week_rows = index.rows
         if not week_rows:
             st.info("No fixtures for the active window. Ask an admin to fetch fixtures and set the active window.")
         else:
@@ -1347,12 +3396,12 @@ def main():
                             # --- NEW DROPDOWNS LOGIC (partial picks, immutable once saved) ---
 
         # 1) Options from active window (teams only, unlocked games only)
-        options, id_to_matchkey, label_to_option = build_team_options_for_active_window()
+        options, id_to_matchkey, label_to_option = build_team_options_for_active_window(index)
         labels = ["— No pick —"] + [o["label"] for o in options]
         label_set = set(labels)
 
         # 2) Existing confirmed picks in the active window (to lock them)
-        existing_opts, existing_mks = existing_picks_in_active_window(username)
+        existing_opts, existing_mks = existing_picks_in_active_window(username, index)
 
         # Map existing picks to team-only labels (if present in options table;
         # if game is now locked, the option may not be in options anymore — still show label)
@@ -1436,9 +3485,13 @@ def main():
         # 5) Confirm: only enabled if no duplicates and you won't exceed the max
         disabled = duplicates or (total_after > MAX_PICKS_PER_WEEK) or (len(chosen_new) == 0)
         if st.button("Confirm Picks", disabled=disabled):
-            saved_count, err = save_user_additional_picks_for_active_window(username, chosen_new)
+            saved_count, err, rejected = save_user_additional_picks_for_active_window(username, chosen_new, index)
+            for r in rejected:
+                st.warning(f"{r['team']} was not saved: {r['reason']}.")
             if err:
                 st.error(err)
+            elif rejected:
+                st.info(f"Saved {saved_count} new pick(s).")
             else:
                 st.success(f"Saved {saved_count} new pick(s).")
                 st.rerun()
@@ -1451,6 +3504,9 @@ def main():
             st.info("No selections yet.")
         else:
             st.dataframe(df, use_container_width=True)
+            st.subheader("By game")
+            st.dataframe(selections_by_fixture(by_matchkey=True),
+                         use_container_width=True)
 
     # --- Player: Leaderboard ---
     if (not admin_flag) and page == "Leaderboard":
@@ -1466,44 +3522,23 @@ def main():
     if page == "Results":
         st.header("Results — published week")
         if admin_flag:
-            if st.button("Fetch results from ESPN",
-                         key="admin_fetch_results"):
-                saved, err = fetch_results_from_espn_for_week()
-                if err:
-                    st.error(err)
-                else:
-                    st.success(
-                        f"Saved/updated {saved} result rows (matches found).")
-            display_df, styler = build_results_table(for_admin=True)
-            if display_df is None:
+            show_poll_status("scores", "ESPN score polling")
+            with st.expander("ESPN request timings"):
+                st.dataframe(recent_fetches("espn"), use_container_width=True)
+            if not show_results_table(for_admin=True):
                 st.info("No fixtures/picks for relevant week to show results.")
-            else:
-                st.write(
-                    "Colors: green = win (3 pts), yellow = push (1 pt), red = loss (0 pts), white = not played"
-                )
-                if styler is None:
-                    st.dataframe(display_df, use_container_width=True)
-                else:
-                    st.write(styler.to_html(), unsafe_allow_html=True)
         else:
             pub = get_published_week()
             if not pub:
                 st.info(
                     "Results will be available once the admin updates them.")
-            else:
-                display_df, styler = build_results_table(for_admin=False)
-                if display_df is None:
-                    st.info(
-                        "No fixtures/picks for the published week to show results."
-                    )
-                else:
-                    st.write(
-                        "Colors: green = win (3 pts), yellow = push (1 pt), red = loss (0 pt), white = not played"
-                    )
-                    if styler is None:
-                        st.dataframe(display_df, use_container_width=True)
-                    else:
-                        st.write(styler.to_html(), unsafe_allow_html=True)
+            elif not show_results_table(for_admin=False):
+                st.info(
+                    "No fixtures/picks for the published week to show results."
+                )
 
 if __name__ == "__main__":
-    main()
+    if "--worker" in sys.argv[1:]:
+        run_worker()
+    else:
+        main()
@@ -0,0 +1,154 @@
+"""
+fetch_results_from_espn_for_week() against a local stub of the ESPN
+scoreboard API serving tests/data/espn_scoreboard_2025_wk1.json (week 1
+of 2025, captured before the Sunday games: two finals, two scheduled).
+
+    python -m unittest discover -s tests
+"""
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import nfl_picks  # noqa: E402
+
+SCOREBOARD = json.loads(
+    (ROOT / "tests" / "data" / "espn_scoreboard_2025_wk1.json").read_text())
+
+# Odds API style fixtures of the same window; the Chiefs/Chargers game is
+# listed the other way round than on ESPN
+FIXTURES = [
+    ("phi-dal", "Philadelphia Eagles", "Dallas Cowboys", "2025-09-05T00:20:00Z", -7.0, 7.0),
+    ("kc-lac", "Kansas City Chiefs", "Los Angeles Chargers", "2025-09-06T00:00:00Z", -3.0, 3.0),
+    ("nyj-pit", "New York Jets", "Pittsburgh Steelers", "2025-09-07T17:00:00Z", 2.5, -2.5),
+]
+
+
+class ScoreboardStub:
+    """
+    ESPN scoreboard on localhost: ?dates=YYYYMMDD answers that UTC day's
+    events. Each entry of fail answers one request for its date with a 503.
+    """
+
+    def __init__(self, payload, fail=()):
+        self.payload = payload
+        self.fail = list(fail)
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                day = parse_qs(urlparse(self.path).query).get("dates", [""])[0]
+                stub.requests.append(day)
+                if day in stub.fail:
+                    stub.fail.remove(day)
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = json.dumps(dict(stub.payload, events=[
+                    ev for ev in stub.payload["events"]
+                    if ev["date"][:10].replace("-", "") == day])).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/scoreboard"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FetchEspnResultsTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self._patch(nfl_picks, "DB_FILE", str(Path(tmp.name) / "test.db"))
+        nfl_picks.init_db()
+        nfl_picks.save_fixtures(FIXTURES)
+        # Thu 4 Sep 00:00 → Tue 9 Sep 00:00 Dublin
+        nfl_picks.set_active_window(
+            nfl_picks.DUBLIN_TZ.localize(datetime(2025, 9, 4)).astimezone(nfl_picks.UTC),
+            nfl_picks.DUBLIN_TZ.localize(datetime(2025, 9, 9)).astimezone(nfl_picks.UTC))
+        # backoff sleeps are recorded, not slept
+        self.sleep = self._patch(nfl_picks.time, "sleep")
+
+    def _patch(self, target, name, value=mock.DEFAULT):
+        patcher = mock.patch.object(target, name, value)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def fetch(self, fail=()):
+        stub = ScoreboardStub(SCOREBOARD, fail)
+        self.addCleanup(stub.close)
+        self._patch(nfl_picks, "ESPN_SCOREBOARD_URL", stub.url)
+        return nfl_picks.fetch_results_from_espn_for_week(), stub
+
+    def fetch_log(self, day):
+        with nfl_picks.db() as conn:
+            return conn.execute(
+                "SELECT attempts, status FROM fetch_log WHERE source='espn' AND request=?",
+                (f"dates={day}", )).fetchone()
+
+    def test_matches_finals_and_skips_scheduled_games(self):
+        (report, err), stub = self.fetch()
+
+        self.assertIsNone(err)
+        self.assertEqual(report, {"inserted": 2, "updated": 0, "unchanged": 0,
+                                  "matched": 2, "final": 2, "scheduled": 1})
+        # swapped orientation is stored in the fixture's own order; the
+        # scheduled 0-0 Jets game and the unknown Falcons game are not saved
+        self.assertEqual(nfl_picks.load_results_map(),
+                         {"phi-dal": (24, 20), "kc-lac": (21, 27)})
+        self.assertEqual(nfl_picks.get_published_week(), (2025, 36))
+        # one request per UTC day of the window, none retried
+        self.assertEqual(sorted(stub.requests),
+                         ["20250903", "20250904", "20250905", "20250906", "20250907"])
+        self.sleep.assert_not_called()
+
+    def test_retries_a_503_with_backoff(self):
+        (report, err), stub = self.fetch(fail=["20250905"])
+
+        self.assertIsNone(err)
+        self.assertEqual(report["matched"], 2)
+        self.assertEqual(nfl_picks.load_results_map(),
+                         {"phi-dal": (24, 20), "kc-lac": (21, 27)})
+        self.assertEqual(stub.requests.count("20250905"), 2)
+        self.assertEqual(self.sleep.call_args_list,
+                         [mock.call(nfl_picks.HTTP_BACKOFF_SECONDS)])
+        self.assertEqual(self.fetch_log("20250905"), (2, "ok"))
+
+    def test_gives_up_after_the_last_retry(self):
+        retries = nfl_picks.HTTP_RETRIES
+        (report, err), stub = self.fetch(fail=["20250905"] * retries)
+
+        self.assertIsNone(err)
+        self.assertEqual(stub.requests.count("20250905"), retries)
+        self.assertEqual(self.sleep.call_args_list,
+                         [mock.call(nfl_picks.HTTP_BACKOFF_SECONDS * 2 ** i)
+                          for i in range(retries - 1)])
+        self.assertEqual(self.fetch_log("20250905"), (retries, "HTTP 503"))
+        # the other days still went through
+        self.assertEqual(nfl_picks.load_results_map(), {"kc-lac": (21, 27)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+iter_json_array() on JSON split into chunks at every possible position.
+
+    python -m unittest discover -s tests
+"""
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from nfl_picks import iter_json_array  # noqa: E402
+
+DOC = json.dumps([
+    12345, -0.5, 1.5e3, "Zürich ⚽", None, True, [], {},
+    {"id": "odds1", "home_team": "Dallas Cowboys",
+     "bookmakers": [{"key": "pinnacle", "point": -3.5}]},
+], ensure_ascii=False)
+
+
+def split_at(data, *cuts):
+    bounds = (0, ) + cuts + (len(data), )
+    return [data[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+class IterJsonArrayTest(unittest.TestCase):
+
+    def test_every_two_chunk_split(self):
+        data = DOC.encode()
+        for cut in range(len(data) + 1):
+            with self.subTest(chunks=split_at(data, cut)):
+                self.assertEqual(list(iter_json_array(split_at(data, cut))),
+                                 json.loads(DOC))
+
+    def test_one_byte_chunks(self):
+        chunks = [bytes([b]) for b in (" \n" + DOC + "\n").encode()]
+        self.assertEqual(list(iter_json_array(chunks)), json.loads(DOC))
+
+    def test_number_split_across_chunks(self):
+        self.assertEqual(list(iter_json_array([b"[1", b"2,3]"])), [12, 3])
+        self.assertEqual(list(iter_json_array(["[1.5e", "3]"])), [1500.0])
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array([b" [", b" ] "])), [])
+
+    def test_malformed(self):
+        for chunks in (["[1 2]"], ["[1", " 2]"], ["[1,]"], ["[,1]"], ["[1,2"],
+                       ["["], [""], ["{}"], ["[1]x"], ["[1", "]]"],
+                       [b'["\xc3']):
+            with self.subTest(chunks=chunks), self.assertRaises(ValueError):
+                list(iter_json_array(chunks))
+
+
+if __name__ == "__main__":
+    unittest.main()